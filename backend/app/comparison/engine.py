@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
-import json
+from typing import List, Optional, Dict, Any, Tuple
 import time
+import orjson
 import requests
 
 from app.core.config import settings
@@ -36,6 +36,82 @@ class ComparisonResult:
     issues: List[Issue]
 
 
+# Prompt pieces shared by the single and batched comparison prompts
+_LENIENCY_RULES = """
+- Parameter names are slightly different but mean the same thing
+- Documentation style differs (formal vs casual)
+- Minor documentation gaps exist (missing optional details)
+- Type hints vs documentation formats differ
+""".strip()
+
+_ANALYSIS_INSTRUCTIONS = """
+ANALYSIS INSTRUCTIONS:
+1. Are these the SAME function semantically? Consider:
+   - Function purpose and behavior
+   - Parameter semantics (does "price" match "cost"? does "discount" match "tax_rate"?)
+   - Required vs optional parameters
+   - Return value meaning
+
+2. Only report CRITICAL mismatches that would cause user confusion or errors:
+   - Missing REQUIRED parameters (users would get runtime errors)
+   - Completely wrong parameter types that would cause errors
+   - Missing critical functionality described in docs
+   - Return type mismatches that break expectations
+
+3. IGNORE minor issues:
+   - Missing type hints in documentation (if code has them)
+   - Documentation style differences
+   - Missing examples or code samples
+   - Minor naming variations with same meaning
+   - Optional documentation details
+
+4. CONFIDENCE SCORING GUIDELINES (be generous - favor high scores):
+   - 90-100%: Functions are essentially the same (semantic match, minor differences OK)
+   - 80-89%: Functions match well, with only minor documentation gaps or style differences
+   - 70-79%: Functions are similar but have some notable differences (missing optional params, etc.)
+   - 60-69%: Functions are related but have moderate differences
+   - 0-59%: Only use for fundamentally different functions or complete mismatches
+   
+   IMPORTANT: Default to higher confidence scores. Minor issues should NOT significantly reduce confidence.
+   Only reduce confidence substantially for CRITICAL mismatches that would cause runtime errors.
+""".strip()
+
+_RESULT_SCHEMA = """
+{
+  "matches": true/false,
+  "confidence": 0-100,
+  "semantic_analysis": "Brief explanation of semantic equivalence",
+  "issues": [
+    {
+      "severity": "high/medium/low",
+      "issue": "description of CRITICAL problem only",
+      "code_has": "what the code shows",
+      "docs_say": "what docs claim",
+      "suggested_fix": "how to fix it"
+    }
+  ]
+}
+""".strip()
+
+_BATCH_RESULT_SCHEMA = """
+  {
+    "index": 0,
+    "matches": true/false,
+    "confidence": 0-100,
+    "semantic_analysis": "Brief explanation of semantic equivalence",
+    "issues": [
+      {
+        "severity": "high/medium/low",
+        "issue": "description of CRITICAL problem only",
+        "code_has": "what the code shows",
+        "docs_say": "what docs claim",
+        "suggested_fix": "how to fix it"
+      }
+    ]
+  }
+""".strip("\n")
+
+
 class GeminiComparator:
     """Gemini-based comparison engine with optional Token Company compression."""
 
@@ -54,31 +130,98 @@ class GeminiComparator:
 
     def compare(self, code_func: FunctionSignature, doc_func: FunctionSignature) -> ComparisonResult:
         prompt = self._build_prompt(code_func, doc_func)
+        response_text = self._call_gemini(self._compress(prompt))
+        result = self._parse_response(response_text, code_func.name)
+
+        return result
 
-        # Only compress if Token Company is enabled
+    def compare_batch(
+        self,
+        pairs: List[Tuple[FunctionSignature, FunctionSignature]],
+        batch_size: int = 16
+    ) -> List[ComparisonResult]:
+        """
+        Compare many (code_func, doc_func) pairs, several per Gemini call.
+        
+        Each call carries up to batch_size pairs and asks for a JSON array
+        of results tagged with the pair's index, so K pairs take about
+        K / batch_size round trips instead of K. Pairs the response leaves
+        out are retried one at a time with compare().
+        
+        Returns:
+            Results in the same order as pairs
+        """
+        results: List[ComparisonResult] = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            if len(batch) == 1:
+                results.append(self.compare(*batch[0]))
+                continue
+
+            response_text = self._call_gemini(self._compress(self._build_batch_prompt(batch)))
+            by_index = self._parse_batch_response(response_text, batch)
+            results.extend(
+                by_index[i] if i in by_index else self.compare(code_func, doc_func)
+                for i, (code_func, doc_func) in enumerate(batch)
+            )
+        return results
+
+    def _compress(self, prompt: str) -> str:
+        """Compress a prompt with Token Company, if enabled."""
         # Use moderate aggressiveness (0.5) for better context preservation
         # while still reducing token usage
-        if self.use_token_company and self.token_client:
-            compressed = self.token_client.compress_input(prompt, aggressiveness=0.5)
-            prompt_text = compressed.get("output", prompt)
-            
-            # Log compression stats if available (for debugging)
-            if compressed.get("compressed") and compressed.get("original_tokens"):
-                original = compressed.get("original_tokens")
-                compressed_tokens = compressed.get("compressed_tokens")
-                if original and compressed_tokens:
-                    reduction = int((1 - compressed_tokens / original) * 100)
-                    if reduction > 0:
-                        print(f"   📉 Token compression: {original} → {compressed_tokens} tokens ({reduction}% reduction)")
-        else:
-            prompt_text = prompt
-
-        response_text = self._call_gemini(prompt_text)
-        result = self._parse_response(response_text, code_func.name)
+        if not (self.use_token_company and self.token_client):
+            return prompt
 
-        return result
+        compressed = self.token_client.compress_input(prompt, aggressiveness=0.5)
+        
+        # Log compression stats if available (for debugging)
+        if compressed.get("compressed") and compressed.get("original_tokens"):
+            original = compressed.get("original_tokens")
+            compressed_tokens = compressed.get("compressed_tokens")
+            if original and compressed_tokens:
+                reduction = int((1 - compressed_tokens / original) * 100)
+                if reduction > 0:
+                    print(f"   📉 Token compression: {original} → {compressed_tokens} tokens ({reduction}% reduction)")
+        return compressed.get("output", prompt)
 
     def _build_prompt(self, code_func: FunctionSignature, doc_func: FunctionSignature) -> str:
+        return f"""
+Perform a SEMANTIC analysis comparing a Python function's code signature with its documentation. Focus on functional equivalence and meaning, not exact string matching.
+
+TASK: Determine if the code and documentation represent the SAME FUNCTION semantically, even if:
+{_LENIENCY_RULES}
+
+{self._describe_pair(code_func, doc_func)}
+
+{_ANALYSIS_INSTRUCTIONS}
+
+Respond with JSON only:
+{_RESULT_SCHEMA}
+""".strip()
+
+    def _build_batch_prompt(self, pairs: List[Tuple[FunctionSignature, FunctionSignature]]) -> str:
+        described = "\n\n".join(
+            f"=== PAIR {i} ===\n{self._describe_pair(code_func, doc_func)}"
+            for i, (code_func, doc_func) in enumerate(pairs)
+        )
+        return f"""
+Perform a SEMANTIC analysis of each of the {len(pairs)} pairs below, comparing a Python function's code signature with its documentation. Focus on functional equivalence and meaning, not exact string matching. Judge every pair on its own.
+
+TASK: For each pair, determine if the code and documentation represent the SAME FUNCTION semantically, even if:
+{_LENIENCY_RULES}
+
+{described}
+
+{_ANALYSIS_INSTRUCTIONS}
+
+Respond with a JSON array only, one object per pair, where "index" is the pair's number:
+[
+{_BATCH_RESULT_SCHEMA}
+]
+""".strip()
+
+    def _describe_pair(self, code_func: FunctionSignature, doc_func: FunctionSignature) -> str:
         # Build detailed parameter information
         code_params_detail = []
         for p in code_func.parameters:
@@ -96,16 +239,7 @@ class GeminiComparator:
                 param_str += f" ({p.type})"
             doc_params_detail.append(f"  - {param_str}")
 
-        return f"""
-Perform a SEMANTIC analysis comparing a Python function's code signature with its documentation. Focus on functional equivalence and meaning, not exact string matching.
-
-TASK: Determine if the code and documentation represent the SAME FUNCTION semantically, even if:
-- Parameter names are slightly different but mean the same thing
-- Documentation style differs (formal vs casual)
-- Minor documentation gaps exist (missing optional details)
-- Type hints vs documentation formats differ
-
-ACTUAL CODE:
+        return f"""ACTUAL CODE:
 Function Name: {code_func.name}
 Parameters:
 {chr(10).join(code_params_detail) if code_params_detail else "  - (no parameters)"}
@@ -117,54 +251,7 @@ Function Name: {doc_func.name}
 Parameters:
 {chr(10).join(doc_params_detail) if doc_params_detail else "  - (no parameters mentioned)"}
 Return Type: {doc_func.return_type or 'not specified'}
-Docstring: {doc_func.docstring[:500] if doc_func.docstring else 'none'}
-
-ANALYSIS INSTRUCTIONS:
-1. Are these the SAME function semantically? Consider:
-   - Function purpose and behavior
-   - Parameter semantics (does "price" match "cost"? does "discount" match "tax_rate"?)
-   - Required vs optional parameters
-   - Return value meaning
-
-2. Only report CRITICAL mismatches that would cause user confusion or errors:
-   - Missing REQUIRED parameters (users would get runtime errors)
-   - Completely wrong parameter types that would cause errors
-   - Missing critical functionality described in docs
-   - Return type mismatches that break expectations
-
-3. IGNORE minor issues:
-   - Missing type hints in documentation (if code has them)
-   - Documentation style differences
-   - Missing examples or code samples
-   - Minor naming variations with same meaning
-   - Optional documentation details
-
-4. CONFIDENCE SCORING GUIDELINES (be generous - favor high scores):
-   - 90-100%: Functions are essentially the same (semantic match, minor differences OK)
-   - 80-89%: Functions match well, with only minor documentation gaps or style differences
-   - 70-79%: Functions are similar but have some notable differences (missing optional params, etc.)
-   - 60-69%: Functions are related but have moderate differences
-   - 0-59%: Only use for fundamentally different functions or complete mismatches
-   
-   IMPORTANT: Default to higher confidence scores. Minor issues should NOT significantly reduce confidence.
-   Only reduce confidence substantially for CRITICAL mismatches that would cause runtime errors.
-
-Respond with JSON only:
-{{
-  "matches": true/false,
-  "confidence": 0-100,
-  "semantic_analysis": "Brief explanation of semantic equivalence",
-  "issues": [
-    {{
-      "severity": "high/medium/low",
-      "issue": "description of CRITICAL problem only",
-      "code_has": "what the code shows",
-      "docs_say": "what docs claim",
-      "suggested_fix": "how to fix it"
-    }}
-  ]
-}}
-""".strip()
+Docstring: {doc_func.docstring[:500] if doc_func.docstring else 'none'}"""
 
     def _call_gemini(self, prompt: str, max_retries: int = 3) -> str:
         """
@@ -235,10 +322,38 @@ Respond with JSON only:
         json_text = text[start:end] if start != -1 and end != -1 else "{}"
 
         try:
-            result = json.loads(json_text)
+            result = orjson.loads(json_text)
         except Exception:
             result = {"matches": False, "confidence": 0, "issues": []}
 
+        return self._to_result(result, func_name)
+
+    def _parse_batch_response(
+        self,
+        text: str,
+        pairs: List[Tuple[FunctionSignature, FunctionSignature]]
+    ) -> Dict[int, ComparisonResult]:
+        """Map each pair index the response covers to its result."""
+        start = text.find("[")
+        end = text.rfind("]") + 1
+        try:
+            entries = orjson.loads(text[start:end]) if start != -1 and end > start else []
+        except Exception:
+            entries = []
+
+        results = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("index"))
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(pairs) and index not in results:
+                results[index] = self._to_result(entry, pairs[index][0].name)
+        return results
+
+    def _to_result(self, result: Dict[str, Any], func_name: str) -> ComparisonResult:
         issues = []
         for i in result.get("issues", []):
             # Handle both dict and string formats from LLM
@@ -3,7 +3,11 @@ Hybrid Comparison Engine
 Combines ML-based embeddings with LLM semantic analysis for optimal accuracy and performance.
 """
 
-from typing import Tuple
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 from dataclasses import dataclass
 
 from app.models.function_signature import FunctionSignature
@@ -34,6 +38,19 @@ class HybridComparator:
     - Low embedding similarity (<0.6): Mark as different, use LLM only if needed
     """
     
+    # Comparison results keyed by a digest of both signatures, shared across
+    # instances so re-analyzing a repo (or another branch) reuses them
+    _CACHE_SIZE = 50_000
+    _cache: "OrderedDict[bytes, HybridComparisonResult]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    # Most of a comparison's time is waiting on the LLM, so compare_batch
+    # keeps up to this many LLM calls in flight
+    MAX_CONCURRENT_COMPARISONS = 16
+    
+    # LLM-bound pairs that compare_batch sends in a single Gemini prompt
+    LLM_BATCH_SIZE = 8
+    
     def __init__(self, use_token_company: bool = True):
         """
         Initialize HybridComparator.
@@ -48,9 +65,15 @@ class HybridComparator:
         self.embedding_threshold_high = 0.80  # Above this, trust embedding only (was 0.85, now lower = more cases use embeddings)
         self.embedding_threshold_medium = 0.55  # Between this and high, use LLM (was 0.60, now lower gap = fewer LLM calls)
         self.embedding_threshold_very_low = 0.30  # Below this, skip LLM (was 0.2, now higher = more skipping, faster)
+        self.use_token_company = use_token_company
+    
+    def prepare(self, code_functions: List[FunctionSignature], doc_functions: List[FunctionSignature]) -> None:
+        """
+        Batch-encode embeddings for functions that are about to be compared.
         
-        # Cache for comparison results (key: (code_func.name, doc_func.name), value: HybridComparisonResult)
-        self._cache: dict = {}
+        Optional: compare works without it, but encodes each pair separately.
+        """
+        self.embedding_matcher.embed_functions(list(code_functions) + list(doc_functions))
     
     def compare(
         self, 
@@ -61,11 +84,91 @@ class HybridComparator:
         Compare two functions using hybrid approach.
         Uses embeddings for fast screening, LLM for detailed analysis when needed.
         """
-        # Check cache first (simple name-based cache for speed)
-        cache_key = (code_func.name.lower(), doc_func.name.lower())
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        # Check cache first
+        cache_key = self._cache_key(code_func, doc_func)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        strategy, similarity, _ = self._route(code_func, doc_func)
+        result = strategy(code_func, doc_func, similarity)
+        
+        # Cache result for future use
+        self._cache_put(cache_key, result)
+        return result
+    
+    def compare_batch(
+        self,
+        pairs: List[Tuple[FunctionSignature, FunctionSignature]]
+    ) -> List[HybridComparisonResult]:
+        """
+        Compare many (code_func, doc_func) pairs.
         
+        Returns results in the same order as pairs. Pairs the embeddings
+        settle are resolved right away. The LLM-bound ones go to Gemini
+        LLM_BATCH_SIZE per prompt, with up to MAX_CONCURRENT_COMPARISONS
+        prompts in flight, so total time is about the slowest few calls
+        rather than one round trip per pair. Identical pairs (e.g.
+        generated or vendored code) are compared once.
+        """
+        keys = [self._cache_key(code_func, doc_func) for code_func, doc_func in pairs]
+        unique = dict(zip(keys, pairs))
+        
+        results = {}
+        llm_bound = {}
+        for key, (code_func, doc_func) in unique.items():
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[key] = cached
+                continue
+            
+            strategy, similarity, uses_llm = self._route(code_func, doc_func)
+            if uses_llm:
+                llm_bound[key] = (strategy, similarity)
+            else:
+                results[key] = strategy(code_func, doc_func, similarity)
+                self._cache_put(key, results[key])
+        
+        llm_keys = list(llm_bound)
+        chunks = [
+            llm_keys[start:start + self.LLM_BATCH_SIZE]
+            for start in range(0, len(llm_keys), self.LLM_BATCH_SIZE)
+        ]
+        
+        def compare_chunk(chunk):
+            return self.llm_comparator.compare_batch(
+                [unique[key] for key in chunk],
+                batch_size=self.LLM_BATCH_SIZE
+            )
+        
+        if len(chunks) <= 1:
+            llm_results = map(compare_chunk, chunks)
+        else:
+            workers = min(self.MAX_CONCURRENT_COMPARISONS, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compare") as executor:
+                llm_results = list(executor.map(compare_chunk, chunks))
+        
+        for chunk, chunk_results in zip(chunks, llm_results):
+            for key, llm_result in zip(chunk, chunk_results):
+                strategy, similarity = llm_bound[key]
+                results[key] = strategy(*unique[key], similarity, llm_result)
+                self._cache_put(key, results[key])
+        
+        return [results[key] for key in keys]
+    
+    def _route(
+        self,
+        code_func: FunctionSignature,
+        doc_func: FunctionSignature
+    ) -> Tuple[Callable[..., HybridComparisonResult], SimilarityScore, bool]:
+        """
+        Pick how to compare a pair, from its embedding similarity.
+        
+        Returns:
+            (strategy, similarity, uses_llm), where strategy is called as
+            strategy(code_func, doc_func, similarity); LLM strategies also
+            take a precomputed LLM result
+        """
         # Step 1: Compute embedding-based similarity
         similarity = self.embedding_matcher.compute_similarity(code_func, doc_func)
         embedding_score = similarity.score
@@ -83,20 +186,64 @@ class HybridComparator:
         # Very low similarity OR very different names = complete mismatch (skip LLM)
         if embedding_score < self.embedding_threshold_very_low or name_similarity < name_threshold:
             # Very different functions - trust embeddings, save LLM calls
-            result = self._embedding_only_very_low(code_func, doc_func, similarity)
-        elif embedding_score >= self.embedding_threshold_high and not has_param_mismatch:
+            return self._embedding_only_very_low, similarity, False
+        if embedding_score >= self.embedding_threshold_high and not has_param_mismatch:
             # High similarity AND no parameter mismatches - trust embeddings, no need for expensive LLM call
-            result = self._embedding_only_result(code_func, doc_func, similarity)
-        elif embedding_score >= self.embedding_threshold_medium:
+            return self._embedding_only_result, similarity, False
+        if embedding_score >= self.embedding_threshold_medium:
             # Medium similarity - use LLM for detailed analysis
-            result = self._hybrid_comparison(code_func, doc_func, similarity)
-        else:
-            # Low-medium similarity (0.3-0.55) - use LLM to confirm and get detailed issues
-            result = self._llm_focused_comparison(code_func, doc_func, similarity)
+            return self._hybrid_comparison, similarity, True
+        # Low-medium similarity (0.3-0.55) - use LLM to confirm and get detailed issues
+        return self._llm_focused_comparison, similarity, True
+    
+    def _cache_get(self, cache_key: bytes) -> Optional[HybridComparisonResult]:
+        """Cached result for a pair, or None (marks it recently used)."""
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+            return cached
+    
+    def _cache_put(self, cache_key: bytes, result: HybridComparisonResult) -> None:
+        """Cache a result, evicting the least recently used past _CACHE_SIZE."""
+        if not self._is_cacheable(result):
+            return
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self._CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def _cache_key(self, code_func: FunctionSignature, doc_func: FunctionSignature) -> bytes:
+        """
+        Digest of everything the comparison looks at.
         
-        # Cache result for future use (keyed by function names)
-        self._cache[cache_key] = result
-        return result
+        File paths and line numbers are left out, so a function that only
+        moved still hits the cache. The Gemini model is included, so
+        switching models doesn't reuse the old model's verdicts.
+        """
+        parts = (self.llm_comparator.model, self.use_token_company) + tuple(
+            (
+                func.name,
+                tuple((p.name, p.type, p.default) for p in func.parameters),
+                func.return_type,
+                func.docstring
+            )
+            for func in (code_func, doc_func)
+        )
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).digest()
+    
+    @staticmethod
+    def _is_cacheable(result: HybridComparisonResult) -> bool:
+        """
+        Whether a result may be cached.
+        
+        An LLM verdict with confidence 0 and no issues is what
+        GeminiComparator falls back to when it can't parse the response;
+        caching it would keep a one-off bad response for every later run.
+        """
+        if result.method not in ("hybrid", "llm_focused"):
+            return True
+        return result.llm_confidence > 0 or bool(result.issues)
     
     def _embedding_only_very_low(
         self,
@@ -114,8 +261,8 @@ class HybridComparator:
                 severity="high",
                 function=code_func.name,
                 issue=f"Functions are completely different (embedding similarity {confidence}%). Code function '{code_func.name}' does not match documented function '{doc_func.name}'.",
-                code_has=f"{code_func.name}({', '.join(p.name for p in code_func.parameters)})",
-                docs_say=f"{doc_func.name}({', '.join(p.name for p in doc_func.parameters)})",
+                code_has=code_func.signature_str,
+                docs_say=doc_func.signature_str,
                 suggested_fix="Check if functions were renamed, or if documentation refers to different code. Consider updating documentation to match actual code."
             )
         ]
@@ -157,11 +304,13 @@ class HybridComparator:
         self,
         code_func: FunctionSignature,
         doc_func: FunctionSignature,
-        similarity: SimilarityScore
+        similarity: SimilarityScore,
+        llm_result: Optional[ComparisonResult] = None
     ) -> HybridComparisonResult:
         """Use both embeddings and LLM for medium-confidence cases."""
-        # Get LLM analysis
-        llm_result = self.llm_comparator.compare(code_func, doc_func)
+        # Get LLM analysis, unless compare_batch already did
+        if llm_result is None:
+            llm_result = self.llm_comparator.compare(code_func, doc_func)
         
         # Combine embedding and LLM scores
         # Weight: 40% embedding, 60% LLM (LLM is more accurate but we trust embeddings when high)
@@ -188,10 +337,12 @@ class HybridComparator:
         self,
         code_func: FunctionSignature,
         doc_func: FunctionSignature,
-        similarity: SimilarityScore
+        similarity: SimilarityScore,
+        llm_result: Optional[ComparisonResult] = None
     ) -> HybridComparisonResult:
         """Use LLM for detailed analysis of low-similarity cases."""
-        llm_result = self.llm_comparator.compare(code_func, doc_func)
+        if llm_result is None:
+            llm_result = self.llm_comparator.compare(code_func, doc_func)
         
         # For low embedding similarity, trust LLM more (it can find semantic equivalence)
         # But don't ignore embedding completely - if embedding is very low (<0.3) and LLM is high,
@@ -84,10 +84,18 @@ def analyze_repository(
     print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*80}\n")
 
+    # Compare every code/doc pair up front: both engines pack several
+    # LLM-bound pairs into each Gemini call
+    pairs = [(code_func, doc_func) for code_func, doc_func in matches if code_func is not None and doc_func is not None]
+    print(f"🔍 {datetime.now().strftime('%H:%M:%S')} - Comparing {len(pairs)} matched pairs...")
+    pair_results = iter(comparator.compare_batch(pairs))
+    print(f"   └─ Done at {datetime.now().strftime('%H:%M:%S')}\n")
+
+    # Per-pair lines report results that are already in, so no timestamps
     for idx, (code_func, doc_func) in enumerate(matches, 1):
         if code_func is None:
             func_name = doc_func.name
-            status_msg = f"⚠️  [{idx}/{total_matches}] {datetime.now().strftime('%H:%M:%S')} - Documented but not in code: {func_name}"
+            status_msg = f"⚠️  [{idx}/{total_matches}] Documented but not in code: {func_name}"
             print(status_msg)
             all_issues.append(Issue(
                 severity="medium",
@@ -103,13 +111,13 @@ def analyze_repository(
             methods_used.append("unmatched")
         elif doc_func is None:
             func_name = code_func.name
-            status_msg = f"📝 [{idx}/{total_matches}] {datetime.now().strftime('%H:%M:%S')} - Code but not documented: {func_name}"
+            status_msg = f"📝 [{idx}/{total_matches}] Code but not documented: {func_name}"
             print(status_msg)
             all_issues.append(Issue(
                 severity="low",
                 function=code_func.name,
                 issue="Function exists in code but is not documented",
-                code_has=f"{code_func.name}({', '.join(p.name for p in code_func.parameters)})",
+                code_has=code_func.signature_str,
                 docs_say="No documentation found",
                 suggested_fix="Add documentation for this function",
             ))
@@ -119,12 +127,12 @@ def analyze_repository(
             methods_used.append("unmatched")
         else:
             func_name = f"{code_func.name} ↔ {doc_func.name}"
-            status_msg = f"🔍 [{idx}/{total_matches}] {datetime.now().strftime('%H:%M:%S')} - Comparing: {func_name}"
+            status_msg = f"🔍 [{idx}/{total_matches}] Compared: {func_name}"
             print(status_msg)
             
             # Perform hybrid or LLM-only comparison
             if use_hybrid:
-                result = comparator.compare(code_func, doc_func)
+                result = next(pair_results)
                 methods_used.append(result.method)
                 method_display = {
                     'embedding_only': '⚡ (embedding-only)',
@@ -141,7 +149,7 @@ def analyze_repository(
                 )
             else:
                 print(f"   └─ Method: 🤖 (LLM-only)")
-                result_comp = comparator.compare(code_func, doc_func)
+                result_comp = next(pair_results)
                 methods_used.append("llm_only")
                 print(f"   └─ Confidence: {result_comp.confidence}%")
             
@@ -3,6 +3,9 @@ Semantic Matching Engine using Embeddings
 Uses sentence transformers for fast semantic similarity computation
 """
 
+import re
+import threading
+from collections import OrderedDict
 from typing import List, Tuple, Dict, Optional
 import numpy as np
 from dataclasses import dataclass
@@ -16,6 +19,10 @@ except ImportError:
 
 from app.models.function_signature import FunctionSignature, Parameter
 
+# camelCase word boundaries, for _normalize_name
+_CAMEL_WORD_RE = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL_BOUNDARY_RE = re.compile('([a-z0-9])([A-Z])')
+
 
 @dataclass
 class SimilarityScore:
@@ -31,8 +38,15 @@ class SemanticMatcher:
     Combines multiple features for robust matching.
     """
     
+    # Most embeddings kept from embed_functions (about 1.5 KB each); a
+    # matcher can live as long as the server
+    _EMBEDDING_CACHE_SIZE = 20_000
+    
     def __init__(self):
         self.encoder = None
+        # Normalized embeddings from embed_functions, keyed by function text
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embeddings_lock = threading.Lock()
         if EMBEDDINGS_AVAILABLE:
             try:
                 # Use a lightweight, fast model optimized for similarity
@@ -75,6 +89,39 @@ class SemanticMatcher:
         
         return ". ".join(parts)
     
+    def embed_functions(self, funcs: List[FunctionSignature], batch_size: int = 64) -> None:
+        """
+        Encode many functions in one batched call and keep their embeddings.
+        
+        Later compute_similarity calls on these functions then only need a
+        dot product instead of running the model per pair.
+        """
+        if self.encoder is None:
+            return
+        
+        texts = [
+            text for text in dict.fromkeys(map(self._encode_function, funcs))
+            if text not in self._embeddings
+        ]
+        if not texts:
+            return
+        
+        try:
+            vectors = self.encoder.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        except Exception as e:
+            print(f"⚠️  Batch embedding failed: {e}")
+            return
+        with self._embeddings_lock:
+            self._embeddings.update(zip(texts, vectors))
+            while len(self._embeddings) > self._EMBEDDING_CACHE_SIZE:
+                self._embeddings.popitem(last=False)
+    
     def compute_similarity(
         self, 
         func1: FunctionSignature, 
@@ -129,25 +176,30 @@ class SemanticMatcher:
         text1 = self._encode_function(func1)
         text2 = self._encode_function(func2)
         
-        embeddings = self.encoder.encode([text1, text2])
-        
-        # Compute cosine similarity
-        dot_product = np.dot(embeddings[0], embeddings[1])
-        norm1 = np.linalg.norm(embeddings[0])
-        norm2 = np.linalg.norm(embeddings[1])
-        
-        similarity = dot_product / (norm1 * norm2)
+        vec1 = self._embeddings.get(text1)
+        vec2 = self._embeddings.get(text2)
+        if vec1 is not None and vec2 is not None:
+            # Pre-encoded and normalized: cosine similarity is the dot product
+            similarity = float(np.dot(vec1, vec2))
+        else:
+            embeddings = self.encoder.encode([text1, text2])
+            
+            # Compute cosine similarity
+            dot_product = np.dot(embeddings[0], embeddings[1])
+            norm1 = np.linalg.norm(embeddings[0])
+            norm2 = np.linalg.norm(embeddings[1])
+            
+            similarity = dot_product / (norm1 * norm2)
         
         # Normalize to 0-1 range (cosine similarity is -1 to 1)
         return max(0, (similarity + 1) / 2)
     
     def _normalize_name(self, name: str) -> str:
         """Normalize function name to handle camelCase, snake_case, etc."""
-        import re
         # Convert camelCase to snake_case
         # e.g., "calculateFactorial" -> "calculate_factorial"
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
+        s1 = _CAMEL_WORD_RE.sub(r'\1_\2', name)
+        s2 = _CAMEL_BOUNDARY_RE.sub(r'\1_\2', s1)
         normalized = s2.lower().replace('_', ' ')
         return normalized
     
@@ -195,6 +247,18 @@ class SemanticMatcher:
         
         if len(s1) > len(s2):
             s1, s2 = s2, s1
+        max_len = len(s2)
+        
+        # A shared prefix/suffix doesn't change the distance, so trim it
+        # before the O(len1 * len2) table (names often differ by a few chars)
+        start = 0
+        while start < len(s1) and s1[start] == s2[start]:
+            start += 1
+        end = 0
+        while end < len(s1) - start and s1[-1 - end] == s2[-1 - end]:
+            end += 1
+        s1 = s1[start:len(s1) - end]
+        s2 = s2[start:len(s2) - end]
         
         distances = list(range(len(s1) + 1))
         for i2, c2 in enumerate(s2):
@@ -210,10 +274,6 @@ class SemanticMatcher:
                     ))
             distances = new_distances
         
-        max_len = max(len(s1), len(s2))
-        if max_len == 0:
-            return 1.0
-        
         distance = distances[-1]
         similarity = 1 - (distance / max_len)
         return max(0.0, similarity)
@@ -292,6 +352,12 @@ class SemanticMatcher:
         # First, try exact name matches
         doc_map = {d.name.lower(): (i, d) for i, d in enumerate(doc_functions)}
         
+        # Code functions without an exact-name match get scored against
+        # every doc, so embed them and the docs in one batch up front
+        unmatched_code = [f for f in code_functions if f.name.lower() not in doc_map]
+        if unmatched_code:
+            self.embed_functions(unmatched_code + list(doc_functions))
+        
         for code_func in code_functions:
             doc_idx, doc_func = doc_map.get(code_func.name.lower(), (None, None))
             
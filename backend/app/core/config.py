@@ -25,6 +25,17 @@ class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./veritas.db")
     
+    # Background analysis workers (concurrent /analyze jobs per server process;
+    # 0 leaves jobs to standalone worker.py processes)
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "2"))
+    
+    # Finished analysis jobs (and their results) are deleted after this long
+    JOB_RETENTION_HOURS: int = int(os.getenv("JOB_RETENTION_HOURS", "168"))
+    
+    # Processing jobs with no progress for this long (e.g. their server
+    # crashed) are put back in the queue on startup
+    JOB_STALE_MINUTES: int = int(os.getenv("JOB_STALE_MINUTES", "60"))
+    
     # CORS Settings
     ALLOWED_ORIGINS: List[str] = os.getenv(
         "ALLOWED_ORIGINS", 
@@ -4,6 +4,7 @@ GitHub App webhook handler - Posts comments on PRs
 """
 
 from fastapi import Request, HTTPException
+import asyncio
 import hmac
 import hashlib
 import os
@@ -73,71 +74,11 @@ async def handle_pull_request(data: dict):
     print(f"📝 Processing PR #{pr_number} in {repo}")
     
     try:
-        # Import analysis pipeline
-        from app.github.auth import get_installation_token, post_pr_comment
-        import asyncio
-        
-        # Run analysis (reuse your existing pipeline!)
-        print(f"🔍 Analyzing {github_url}...")
-        
-        # Import and run your analysis
-        from app.utils.git_utils import clone_repo, discover_files, cleanup_repo
-        from app.parsers.parser_factory import parse_code
-        from app.parsers.markdown_parser import parse_markdown
-        from app.comparison.hybrid_engine import HybridComparator
-        
-        # Quick analysis
-        repo_path = clone_repo(github_url)
-        files = discover_files(repo_path)
-        
-        # Parse (simplified for speed)
-        code_functions = []
-        for code_file in files['code'][:50]:  # Limit to 50 files for speed
-            try:
-                with open(code_file, 'r', encoding='utf-8') as f:
-                    functions = parse_code(code_file, f.read())
-                    code_functions.extend(functions)
-            except:
-                pass
-        
-        doc_functions = []
-        for doc_file in files['docs']:
-            try:
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    docs = parse_markdown(f.read())
-                    doc_functions.extend(docs)
-            except:
-                pass
-        
-        # Compare
-        comparator = HybridComparator()
-        all_issues = []
-        verified = 0
-        total = 0
-        
-        code_func_map = {f.name.lower(): f for f in code_functions}
-        doc_func_map = {f.name.lower(): f for f in doc_functions}
-        
-        for func_name in list(code_func_map.keys())[:20]:  # Check first 20
-            if func_name in doc_func_map:
-                total += 1
-                result = comparator.compare(code_func_map[func_name], doc_func_map[func_name])
-                if result.matches:
-                    verified += 1
-                all_issues.extend(result.issues)
-        
-        trust_score = int((verified / total) * 100) if total > 0 else 0
-        
-        cleanup_repo(repo_path)
-        
-        # Generate comment
-        comment = generate_comment(trust_score, len(all_issues), all_issues[:5])
-        
-        # Get auth token and post comment
-        token = get_installation_token(installation_id)
-        post_pr_comment(repo, pr_number, token, comment)
-        
-        print(f"✅ Posted comment on PR #{pr_number}")
+        # Clone, parse, compare and post are all blocking, so run them on a
+        # worker thread instead of stalling the event loop for every request
+        trust_score = await asyncio.to_thread(
+            _analyze_pr, repo, pr_number, installation_id, github_url
+        )
         
         return {
             "status": "success",
@@ -152,6 +93,75 @@ async def handle_pull_request(data: dict):
         traceback.print_exc()
         return {"status": "error", "error": str(e)}
 
+def _analyze_pr(repo: str, pr_number: int, installation_id: int, github_url: str) -> int:
+    """Analyze a PR's repository and post the result as a comment; returns the trust score."""
+    # Import analysis pipeline
+    from app.github.auth import get_installation_token, post_pr_comment
+    
+    # Run analysis (reuse your existing pipeline!)
+    print(f"🔍 Analyzing {github_url}...")
+    
+    # Import and run your analysis
+    from app.utils.git_utils import clone_repo, discover_files, cleanup_repo, SOURCE_PATTERNS
+    from app.parsers.parser_factory import parse_code
+    from app.parsers.markdown_parser import parse_markdown
+    from app.comparison.hybrid_engine import HybridComparator
+    
+    # Quick analysis
+    repo_path = clone_repo(github_url, depth=1, blob_filter="blob:none", sparse_paths=SOURCE_PATTERNS)
+    files = discover_files(repo_path)
+    
+    # Parse (simplified for speed)
+    code_functions = []
+    for code_file in files['code'][:50]:  # Limit to 50 files for speed
+        try:
+            with open(code_file, 'r', encoding='utf-8') as f:
+                functions = parse_code(code_file, f.read())
+                code_functions.extend(functions)
+        except:
+            pass
+    
+    doc_functions = []
+    for doc_file in files['docs']:
+        try:
+            with open(doc_file, 'r', encoding='utf-8') as f:
+                docs = parse_markdown(f.read())
+                doc_functions.extend(docs)
+        except:
+            pass
+    
+    # Compare
+    comparator = HybridComparator()
+    all_issues = []
+    verified = 0
+    total = 0
+    
+    code_func_map = {f.name.lower(): f for f in code_functions}
+    doc_func_map = {f.name.lower(): f for f in doc_functions}
+    
+    for func_name in list(code_func_map.keys())[:20]:  # Check first 20
+        if func_name in doc_func_map:
+            total += 1
+            result = comparator.compare(code_func_map[func_name], doc_func_map[func_name])
+            if result.matches:
+                verified += 1
+            all_issues.extend(result.issues)
+    
+    trust_score = int((verified / total) * 100) if total > 0 else 0
+    
+    cleanup_repo(repo_path)
+    
+    # Generate comment
+    comment = generate_comment(trust_score, len(all_issues), all_issues[:5])
+    
+    # Get auth token and post comment
+    token = get_installation_token(installation_id)
+    post_pr_comment(repo, pr_number, token, comment)
+    
+    print(f"✅ Posted comment on PR #{pr_number}")
+    
+    return trust_score
+
 def generate_comment(trust_score: int, issue_count: int, top_issues: list) -> str:
     """Generate markdown comment for PR."""
     
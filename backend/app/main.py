@@ -3,6 +3,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.log_config import setup_logging
+
+# Route log records through a background queue listener; set up before the
+# route imports so warnings logged at import time go through it too
+setup_logging()
+
 from app.api.routes import health, analysis, auth, dashboard, pr_analysis
 from app.database import Base, engine
 
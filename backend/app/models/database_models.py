@@ -130,3 +130,17 @@ class AnalysisHistory(Base):
     discrepancies_count = Column(Integer, nullable=False)
     analysis_data = Column(Text, nullable=True)  # JSON string of full analysis metadata (renamed from 'metadata' - reserved in SQLAlchemy)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class AnalysisJob(Base):
+    """State of a background repository analysis job."""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    status = Column(String, nullable=False)
+    github_url = Column(String, nullable=False)
+    progress = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)  # JSON string of the final analysis result
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,14 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Parameter:
     """Represents a function parameter"""
     name: str
     type: Optional[str] = None
     default: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class FunctionSignature:
     """Represents a parsed function from code"""
     name: str
@@ -17,6 +17,11 @@ class FunctionSignature:
     file_path: str
     return_type: Optional[str] = None
     docstring: Optional[str] = None
+    # "name(a, b)", built once here rather than every time a report needs it
+    signature_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.signature_str = f"{self.name}({', '.join(p.name for p in self.parameters)})"
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
@@ -1,10 +1,28 @@
 # Java parser - extracts class/method signatures using regex patterns
 
 import re
+from functools import lru_cache
 from typing import List, Optional
 from app.models.function_signature import FunctionSignature, Parameter
 
 
+# Patterns are compiled once at import, not looked up per line
+_CLASS_RE = re.compile(r'^(?:public\s+|private\s+|protected\s+)?(?:abstract\s+)?(?:final\s+)?class\s+(\w+)')
+_INTERFACE_RE = re.compile(r'^(?:public\s+)?interface\s+(\w+)')
+# Pattern: (modifiers) returnType methodName(params) (throws...)? {
+_METHOD_RE = re.compile(r'^(public\s+|private\s+|protected\s+)?(static\s+)?(final\s+)?(synchronized\s+)?(\w+(?:<[^>]+>)?)\s+(\w+)\s*\(([^)]*)\)')
+# Pattern: (final )? Type name or Type... name (varargs)
+_PARAM_RE = re.compile(r'(final\s+)?(\w+(?:<[^>]+>)?(?:\[\])?(?:\.\.\.)?)\s+(\w+)')
+_JAVADOC_DELIMITER_RE = re.compile(r'/\*\*|\*/')
+_JAVADOC_LINE_PREFIX_RE = re.compile(r'^\s*\*\s?', re.MULTILINE)
+
+
+@lru_cache(maxsize=256)
+def _constructor_re(class_name: str) -> re.Pattern:
+    """Constructor pattern for a class: ClassName(params) {"""
+    return re.compile(rf'^(public\s+|private\s+|protected\s+)?{class_name}\s*\(([^)]*)\)')
+
+
 def parse_java(code: str, filename: str = "") -> List[FunctionSignature]:
     """
     Parse Java code and extract method signatures.
@@ -21,21 +39,19 @@ def parse_java(code: str, filename: str = "") -> List[FunctionSignature]:
         stripped = line.strip()
         
         # Track class context
-        class_match = re.match(r'^(?:public\s+|private\s+|protected\s+)?(?:abstract\s+)?(?:final\s+)?class\s+(\w+)', stripped)
+        class_match = _CLASS_RE.match(stripped)
         if class_match:
             current_class = class_match.group(1)
             continue
         
         # Interface
-        interface_match = re.match(r'^(?:public\s+)?interface\s+(\w+)', stripped)
+        interface_match = _INTERFACE_RE.match(stripped)
         if interface_match:
             current_class = interface_match.group(1)
             continue
         
         # Parse method signature
-        # Pattern: (modifiers) returnType methodName(params) (throws...)? {
-        method_pattern = r'^(public\s+|private\s+|protected\s+)?(static\s+)?(final\s+)?(synchronized\s+)?(\w+(?:<[^>]+>)?)\s+(\w+)\s*\(([^)]*)\)'
-        match = re.match(method_pattern, stripped)
+        match = _METHOD_RE.match(stripped)
         
         if match:
             return_type = match.group(5)
@@ -59,8 +75,7 @@ def parse_java(code: str, filename: str = "") -> List[FunctionSignature]:
         
         # Constructor pattern: ClassName(params) {
         if current_class:
-            constructor_pattern = rf'^(public\s+|private\s+|protected\s+)?{current_class}\s*\(([^)]*)\)'
-            match = re.match(constructor_pattern, stripped)
+            match = _constructor_re(current_class).match(stripped)
             if match:
                 params = _parse_java_params(match.group(2))
                 functions.append(FunctionSignature(
@@ -91,8 +106,7 @@ def _parse_java_params(params_str: str) -> List[Parameter]:
         if not part:
             continue
         
-        # Pattern: (final )? Type name or Type... name (varargs)
-        match = re.match(r'(final\s+)?(\w+(?:<[^>]+>)?(?:\[\])?(?:\.\.\.)?)\s+(\w+)', part)
+        match = _PARAM_RE.match(part)
         if match:
             param_type = match.group(2)
             name = match.group(3)
@@ -129,6 +143,6 @@ def _attach_javadoc(code: str, functions: List[FunctionSignature]) -> None:
         
         if javadoc_lines:
             javadoc = '\n'.join(javadoc_lines)
-            javadoc = re.sub(r'/\*\*|\*/', '', javadoc)
-            javadoc = re.sub(r'^\s*\*\s?', '', javadoc, flags=re.MULTILINE)
+            javadoc = _JAVADOC_DELIMITER_RE.sub('', javadoc)
+            javadoc = _JAVADOC_LINE_PREFIX_RE.sub('', javadoc)
             func.docstring = javadoc.strip()
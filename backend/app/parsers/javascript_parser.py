@@ -3,6 +3,15 @@ from typing import List
 from ..models.function_signature import FunctionSignature, Parameter
 
 
+# Patterns are compiled once at import, not per file
+# function name(param1: type, param2: type): returnType { ... }
+_FUNCTION_RE = re.compile(r'function\s+(\w+)\s*\((.*?)\)(?:\s*:\s*([\w<>\[\]]+))?\s*\{')
+# const func = (params) => { ... } or const func = (params): type => { ... }
+_ARROW_RE = re.compile(r'(?:const|let|var)\s+(\w+)\s*=\s*\((.*?)\)(?:\s*:\s*([\w<>\[\]]+))?\s*=>')
+# methodName(params): returnType { ... }
+_METHOD_RE = re.compile(r'(?:public|private|protected)?\s*(?:async)?\s*(\w+)\s*\((.*?)\)(?:\s*:\s*([\w<>\[\]]+))?\s*\{')
+
+
 def parse_javascript(code: str, file_path: str) -> List[FunctionSignature]:
     """
     Parse JavaScript or TypeScript code using regex
@@ -18,10 +27,7 @@ def parse_javascript(code: str, file_path: str) -> List[FunctionSignature]:
     functions = []
     
     # Pattern 1: function declarations
-    # Matches: function name(param1: type, param2: type): returnType { ... }
-    func_pattern = r'function\s+(\w+)\s*\((.*?)\)(?:\s*:\s*([\w<>\[\]]+))?\s*\{'
-    
-    for match in re.finditer(func_pattern, code):
+    for match in _FUNCTION_RE.finditer(code):
         name = match.group(1)
         params_str = match.group(2)
         return_type = match.group(3)
@@ -39,10 +45,7 @@ def parse_javascript(code: str, file_path: str) -> List[FunctionSignature]:
         ))
     
     # Pattern 2: arrow functions
-    # Matches: const func = (params) => { ... } or const func = (params): type => { ... }
-    arrow_pattern = r'(?:const|let|var)\s+(\w+)\s*=\s*\((.*?)\)(?:\s*:\s*([\w<>\[\]]+))?\s*=>'
-    
-    for match in re.finditer(arrow_pattern, code):
+    for match in _ARROW_RE.finditer(code):
         name = match.group(1)
         params_str = match.group(2)
         return_type = match.group(3)
@@ -60,10 +63,7 @@ def parse_javascript(code: str, file_path: str) -> List[FunctionSignature]:
         ))
     
     # Pattern 3: class methods (TypeScript/ES6)
-    # Matches: methodName(params): returnType { ... }
-    method_pattern = r'(?:public|private|protected)?\s*(?:async)?\s*(\w+)\s*\((.*?)\)(?:\s*:\s*([\w<>\[\]]+))?\s*\{'
-    
-    for match in re.finditer(method_pattern, code):
+    for match in _METHOD_RE.finditer(code):
         name = match.group(1)
         # Skip constructors and common non-method words
         if name in ['if', 'while', 'for', 'switch', 'catch', 'constructor']:
@@ -5,6 +5,50 @@ from typing import List, Dict, Any
 from app.models.function_signature import FunctionSignature, Parameter
 
 
+# Patterns are compiled once at import, not looked up per line/file
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+_PARAMETERS_HEADING_RE = re.compile(r'^#{1,6}\s+Parameters?', re.IGNORECASE)
+_RETURNS_HEADING_RE = re.compile(r'^#{1,6}\s+Returns?', re.IGNORECASE)
+_DOC_PREFIX_RE = re.compile(r'^doc[-_]?', re.IGNORECASE)
+_IDENTIFIER_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_.-]*$')
+_WORD_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9]*$')
+
+_SECTION_FLAGS = re.DOTALL | re.IGNORECASE | re.MULTILINE
+
+# Parameters section: with a heading, or direct "Parameters" text (no heading)
+_PARAMS_SECTION_RES = (
+    re.compile(r'(?:###\s+Parameters?|##\s+Parameters?)\s*\n(.*?)(?=\n###|\n##|\nReturns|\Z)', _SECTION_FLAGS),
+    re.compile(r'^Parameters?\s*\n(.*?)(?=\nReturns|\n###|\n##|\Z)', _SECTION_FLAGS),
+)
+
+# One parameter line, tried in order:
+#   - `name` (type): desc / - `name`: desc / name (type): desc / name: desc
+_PARAM_LINE_RES = (
+    re.compile(r'[-*]\s*`(\w+)`\s*\(([^)]+)\)\s*:'),
+    re.compile(r'[-*]\s*`(\w+)`\s*:'),
+    re.compile(r'^(\w+)\s*\(([^)]+)\)\s*:'),
+    re.compile(r'^(\w+)\s*:'),
+)
+
+# Returns section: type in backticks (with heading / direct text), then whole content / next line
+_RETURNS_RES = (
+    re.compile(r'(?:###\s+Returns?|##\s+Returns?)\s*\n.*?[-*]\s*`([^`]+)`', _SECTION_FLAGS),
+    re.compile(r'^Returns?\s*\n.*?[-*]\s*`([^`]+)`', _SECTION_FLAGS),
+    re.compile(r'(?:###\s+Returns?|##\s+Returns?)\s*\n(.*?)(?=\n###|\n##|\n[A-Z]|\Z)', _SECTION_FLAGS),
+    re.compile(r'^Returns?\s*\n([^\n]+)', _SECTION_FLAGS),
+)
+
+# Function signatures in code blocks: Python def, JS function, Java-style
+_CODE_BLOCK_SIGNATURE_RES = (
+    re.compile(r'def\s+(\w+)\s*\(([^)]*)\)'),
+    re.compile(r'function\s+(\w+)\s*\(([^)]*)\)'),
+    re.compile(r'(?:public|private|void|\w+)\s+(\w+)\s*\(([^)]*)\)'),
+)
+
+# Inline references: `functionName(...)` or `moduleName.functionName(...)`
+_INLINE_REF_RE = re.compile(r'`(?:[\w.]+\.)?(\w+)\(([^)]*)\)`')
+
+
 def parse_markdown(code: str, filename: str = "") -> List[FunctionSignature]:
     """
     Parse Markdown and extract documented function references.
@@ -26,7 +70,7 @@ def parse_markdown(code: str, filename: str = "") -> List[FunctionSignature]:
         import os
         base_name = os.path.splitext(os.path.basename(filename))[0]
         # Remove common prefixes: doc_, doc-
-        name = re.sub(r'^doc[-_]?', '', base_name, flags=re.IGNORECASE)
+        name = _DOC_PREFIX_RE.sub('', base_name)
         if name and name != base_name:  # Only use if we actually stripped something
             filename_func_name = name
     
@@ -46,7 +90,7 @@ def parse_markdown(code: str, filename: str = "") -> List[FunctionSignature]:
         line_num = i + 1
         
         # Track headings - check if they look like function names
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
+        heading_match = _HEADING_RE.match(line)
         if heading_match:
             heading_level = len(heading_match.group(1))
             heading_text = heading_match.group(2).strip()
@@ -79,9 +123,9 @@ def parse_markdown(code: str, filename: str = "") -> List[FunctionSignature]:
                 continue
             
             # Track if this is a Parameters or Returns subsection
-            if re.match(r'^#{1,6}\s+Parameters?', line, re.IGNORECASE):
+            if _PARAMETERS_HEADING_RE.match(line):
                 in_parameters_section = True
-            elif re.match(r'^#{1,6}\s+Returns?', line, re.IGNORECASE):
+            elif _RETURNS_HEADING_RE.match(line):
                 in_returns_section = True
             
             # Add the heading itself to section content for nested headings
@@ -165,22 +209,18 @@ def parse_markdown(code: str, filename: str = "") -> List[FunctionSignature]:
     if not functions and filename:
         import os
         base_name = os.path.splitext(os.path.basename(filename))[0]
-        name = re.sub(r'^doc[-_]?', '', base_name, flags=re.IGNORECASE)
+        name = _DOC_PREFIX_RE.sub('', base_name)
         if name and name != base_name and _looks_like_function_name(name):
             func = _parse_function_from_content(name, lines, filename)
             if func:
                 functions.append(func)
     
-    # Deduplicate functions by name (keep first occurrence)
-    seen_names = set()
-    deduplicated = []
+    # Deduplicate functions by name (keep first occurrence, in order)
+    deduplicated = {}
     for func in functions:
-        name_key = func.name.lower()
-        if name_key not in seen_names:
-            seen_names.add(name_key)
-            deduplicated.append(func)
+        deduplicated.setdefault(func.name.lower(), func)
     
-    return deduplicated
+    return list(deduplicated.values())
 
 
 def _looks_like_function_name(text: str) -> bool:
@@ -226,7 +266,7 @@ def _looks_like_function_name(text: str) -> bool:
     # If it's a single word or has dots/underscores, check pattern
     if ' ' not in clean_text:
         # Single identifier: must match typical function name pattern
-        if re.match(r'^[a-zA-Z_][a-zA-Z0-9_.-]*$', clean_text):
+        if _IDENTIFIER_RE.match(clean_text):
             return True
     
     # If it has spaces (multi-word), allow if:
@@ -237,11 +277,11 @@ def _looks_like_function_name(text: str) -> bool:
         # Skip if starts with common article/preposition
         if words[0].lower() not in ('the', 'a', 'an', 'how', 'what', 'when', 'where', 'why', 'to'):
             # Check if words look like identifier parts
-            if all(re.match(r'^[a-zA-Z][a-zA-Z0-9]*$', w) for w in words):
+            if all(_WORD_RE.match(w) for w in words):
                 return True
     
     # Try to match common function naming patterns
-    if re.match(r'^[a-zA-Z_][a-zA-Z0-9_.-]*$', clean_text):
+    if _IDENTIFIER_RE.match(clean_text):
         return True
     
     return False
@@ -271,14 +311,9 @@ def _parse_function_from_heading(heading: str, heading_line: int, section_conten
     
     # Extract Parameters section content
     # Try multiple patterns: with headings, without headings (direct "Parameters" text)
-    params_patterns = [
-        r'(?:###\s+Parameters?|##\s+Parameters?)\s*\n(.*?)(?=\n###|\n##|\nReturns|\Z)',  # With heading
-        r'^Parameters?\s*\n(.*?)(?=\nReturns|\n###|\n##|\Z)',  # Direct "Parameters" text (no heading)
-    ]
-    
     params_section = None
-    for pattern in params_patterns:
-        params_match = re.search(pattern, section_text, re.DOTALL | re.IGNORECASE | re.MULTILINE)
+    for pattern in _PARAMS_SECTION_RES:
+        params_match = pattern.search(section_text)
         if params_match:
             params_section = params_match.group(1)
             break
@@ -288,13 +323,6 @@ def _parse_function_from_heading(heading: str, heading_line: int, section_conten
         # Or: param_name (type): description (no dash, no backticks)
         # Or: - `param_name`: description (no type)
         # Or: param_name: description (no dash, no backticks, no type)
-        param_patterns = [
-            r'[-*]\s*`(\w+)`\s*\(([^)]+)\)\s*:',  # `name` (type): desc
-            r'[-*]\s*`(\w+)`\s*:',                 # `name`: desc (no type)
-            r'^(\w+)\s*\(([^)]+)\)\s*:',          # name (type): desc (no dash, no backticks)
-            r'^(\w+)\s*:',                         # name: desc (no dash, no backticks, no type)
-        ]
-        
         # Split into lines and parse each line
         for line in params_section.split('\n'):
             line = line.strip()
@@ -302,8 +330,8 @@ def _parse_function_from_heading(heading: str, heading_line: int, section_conten
                 continue
             
             # Try each pattern in order
-            for pattern in param_patterns:
-                match = re.match(pattern, line)
+            for pattern in _PARAM_LINE_RES:
+                match = pattern.match(line)
                 if match:
                     param_name = match.group(1)
                     param_type = None
@@ -319,16 +347,9 @@ def _parse_function_from_heading(heading: str, heading_line: int, section_conten
     # Or "Returns: `float`" or "### Returns\n- `float`: ..."
     # Or "Returns\nfloat: description" (no heading markdown, no dash)
     # Or "Returns\ntype: description" (simple format)
-    returns_patterns = [
-        r'(?:###\s+Returns?|##\s+Returns?)\s*\n.*?[-*]\s*`([^`]+)`',  # With heading markdown
-        r'^Returns?\s*\n.*?[-*]\s*`([^`]+)`',                         # Direct "Returns" text
-        r'(?:###\s+Returns?|##\s+Returns?)\s*\n(.*?)(?=\n###|\n##|\n[A-Z]|\Z)',  # With heading, capture content
-        r'^Returns?\s*\n([^\n]+)',                                    # Direct "Returns" text, capture next line
-    ]
-    
     return_type = None
-    for pattern in returns_patterns:
-        returns_match = re.search(pattern, section_text, re.DOTALL | re.IGNORECASE | re.MULTILINE)
+    for pattern in _RETURNS_RES:
+        returns_match = pattern.search(section_text)
         if returns_match:
             return_type_str = returns_match.group(1).strip().rstrip('.,;')
             # Extract type from formats like "number[]: description" or just "number[]"
@@ -355,17 +376,8 @@ def _parse_code_block(code: str, lang: str, start_line: int, filename: str, head
     functions = []
     
     # Simple function signature patterns in documentation
-    patterns = [
-        # Python-style: def name(params):
-        r'def\s+(\w+)\s*\(([^)]*)\)',
-        # JS-style: function name(params) or name(params) =>
-        r'function\s+(\w+)\s*\(([^)]*)\)',
-        # Java-style: returnType name(params)
-        r'(?:public|private|void|\w+)\s+(\w+)\s*\(([^)]*)\)',
-    ]
-    
-    for pattern in patterns:
-        for match in re.finditer(pattern, code):
+    for pattern in _CODE_BLOCK_SIGNATURE_RES:
+        for match in pattern.finditer(code):
             name = match.group(1)
             params_str = match.group(2) if len(match.groups()) > 1 else ""
             
@@ -395,14 +407,11 @@ def _parse_inline_refs(line: str, line_num: int, filename: str) -> List[Function
     """Parse inline code references like `functionName(params)`."""
     functions = []
     
-    # Pattern: `functionName(...)` or `moduleName.functionName(...)`
-    pattern = r'`(?:[\w.]+\.)?(\w+)\(([^)]*)\)`'
-    
     # Common non-function patterns to skip
     skip_patterns = ['print', 'log', 'console', 'example', 'example_', 'test_', 
                      'if', 'while', 'for', 'return', 'yield', 'assert', 'raise']
     
-    for match in re.finditer(pattern, line):
+    for match in _INLINE_REF_RE.finditer(line):
         name = match.group(1)
         params_str = match.group(2)
         
@@ -440,7 +449,7 @@ def extract_sections(code: str) -> List[Dict[str, Any]]:
     current_content = []
     
     for i, line in enumerate(lines):
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
+        heading_match = _HEADING_RE.match(line)
         
         if heading_match:
             if current_section:
@@ -1,6 +1,11 @@
 # Parser Factory - auto-detects language from filename and routes to correct parser
 
-from typing import List
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, List, Optional, Tuple
 from app.models.function_signature import FunctionSignature
 
 
@@ -13,23 +18,25 @@ def parse_code(filename: str, code: str) -> List[FunctionSignature]:
     if not code or not code.strip():
         return []
     
-    filename_lower = filename.lower()
-    
-    if filename_lower.endswith('.java'):
-        return _parse_java(code, filename)
-    elif filename_lower.endswith(('.md', '.markdown')):
-        return _parse_markdown(code, filename)
-    elif filename_lower.endswith('.json'):
-        return _parse_json(code, filename)
-    elif filename_lower.endswith('.py'):
-        return _parse_python(code, filename)
-    elif filename_lower.endswith(('.js', '.jsx')):
-        return _parse_javascript(code, filename)
-    elif filename_lower.endswith(('.ts', '.tsx')):
-        return _parse_typescript(code, filename)
-    else:
+    parser = get_parser_for(filename)
+    if parser is None:
         # Not an error - just unsupported file type
         return []
+    return parser(code, filename)
+
+
+def get_parser_for(filename: str) -> Optional[Callable[[str, str], List[FunctionSignature]]]:
+    """
+    Get the parser for a filename (or bare extension like ".py").
+    
+    Resolve once when parsing many files of one type, then call
+    parser(code, filename) directly. Returns None for unsupported types.
+    """
+    filename_lower = filename.lower()
+    for extensions, parser in _PARSERS:
+        if filename_lower.endswith(extensions):
+            return parser
+    return None
 
 
 def get_supported_extensions() -> List[str]:
@@ -42,6 +49,16 @@ def is_supported(filename: str) -> bool:
     return any(filename.lower().endswith(ext) for ext in get_supported_extensions())
 
 
+def precompile_all() -> None:
+    """
+    Import every parser now, compiling their regex patterns.
+    
+    Parsers are otherwise imported on first use, so the first file of each
+    language pays for it; call this before parsing in a loop or timing parses.
+    """
+    from . import java_parser, javascript_parser, json_parser, markdown_parser, python_parser  # noqa: F401
+
+
 # ============================================================================
 # INTERNAL - Route to actual parsers
 # ============================================================================
@@ -100,10 +117,129 @@ def _parse_typescript(code: str, filename: str) -> List[FunctionSignature]:
         return []
 
 
+# Checked in order by get_parser_for
+_PARSERS = (
+    ('.java', _parse_java),
+    (('.md', '.markdown'), _parse_markdown),
+    ('.json', _parse_json),
+    ('.py', _parse_python),
+    (('.js', '.jsx'), _parse_javascript),
+    (('.ts', '.tsx'), _parse_typescript),
+)
+
+
 # ============================================================================
 # BATCH UTILITIES
 # ============================================================================
 
+# Larger files (generated bundles, data dumps) are skipped rather than read
+# whole; parsing needs the full decoded text plus its AST in memory
+MAX_SOURCE_BYTES = 5 * 1024 * 1024
+
+# Parsed functions keyed by (repo-relative path, content digest), so
+# re-analyzing a repo skips files that haven't changed. The digest is the
+# git blob SHA when the caller has it (no read needed to check the cache),
+# else a SHA-256 of the file. The cache is per process; long-lived parse
+# workers each keep their own across analyses.
+_PARSE_CACHE_SIZE = 4096
+_parse_cache: "OrderedDict[Tuple[str, bytes], Tuple[str, List[FunctionSignature]]]" = OrderedDict()
+# Analyses running in threads of one process share the cache
+_parse_cache_lock = threading.Lock()
+
+
+def parse_code_file(
+    file_path: str,
+    blob_sha: Optional[str] = None,
+    root: Optional[str] = None
+) -> List[FunctionSignature]:
+    """
+    Read and parse a code file from disk.
+    
+    Errors are reported and yield no functions, so this is safe to map
+    over many files (e.g. in a process pool). Pass the repository root
+    to cache results by file content, and the file's git blob SHA (if
+    known) to check that cache without reading the file.
+    """
+    return _parse_file(file_path, blob_sha, root, lambda content: parse_code(file_path, content))
+
+
+def parse_doc_file(
+    file_path: str,
+    blob_sha: Optional[str] = None,
+    root: Optional[str] = None
+) -> List[FunctionSignature]:
+    """
+    Read and parse a markdown doc file from disk.
+    
+    Like parse_code_file, errors are reported and yield no functions.
+    """
+    from .markdown_parser import parse_markdown
+    return _parse_file(file_path, blob_sha, root, parse_markdown)
+
+
+def _parse_file(
+    file_path: str,
+    blob_sha: Optional[str],
+    root: Optional[str],
+    parse: Callable[[str], List[FunctionSignature]]
+) -> List[FunctionSignature]:
+    try:
+        key = None
+        if root is not None and blob_sha:
+            key = (os.path.relpath(file_path, root), bytes.fromhex(blob_sha))
+            cached = _get_cached(key, file_path)
+            if cached is not None:
+                return cached
+        
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_SOURCE_BYTES:
+                print(f"Skipping {file_path}: {size // (1024 * 1024)} MB is over the parse limit")
+                return []
+            raw = f.read()
+        
+        if root is None:
+            return parse(_decode_source(raw))
+        
+        if key is None:
+            key = (os.path.relpath(file_path, root), hashlib.sha256(raw).digest())
+            cached = _get_cached(key, file_path)
+            if cached is not None:
+                return cached
+        
+        functions = parse(_decode_source(raw))
+        with _parse_cache_lock:
+            _parse_cache[key] = (file_path, functions)
+            if len(_parse_cache) > _PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        return functions
+    except Exception as e:
+        print(f"Error parsing {file_path}: {e}")
+        return []
+
+
+def _get_cached(key: Tuple[str, bytes], file_path: str) -> Optional[List[FunctionSignature]]:
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is None:
+            return None
+        _parse_cache.move_to_end(key)
+    # Same file in a new clone: point the functions at its current path
+    cached_path, functions = cached
+    return [
+        replace(func, file_path=file_path) if func.file_path == cached_path else replace(func)
+        for func in functions
+    ]
+
+
+def _decode_source(raw: bytes) -> str:
+    """Decode like open(..., 'r', encoding='utf-8'), including newline translation."""
+    content = raw.decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
 def parse_multiple_files(files: dict) -> dict:
     """Parse multiple files at once."""
     results = {}
@@ -1,6 +1,6 @@
 # Comparator - compares parsed code vs docs to find missing/outdated documentation
 
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any
 from app.models.schemas import DiscrepancyReport, DiscrepancyType
 
 
@@ -48,23 +48,29 @@ class Comparator:
     
     def _compare_functions(
         self, 
-        code_functions: List[Dict], 
-        doc_functions: List[Dict]
+        code_functions: Iterable[Dict], 
+        doc_functions: Iterable[Dict]
     ) -> None:
         """
         Compare function definitions in code vs documentation.
         
         Args:
-            code_functions: Functions extracted from code
-            doc_functions: Functions referenced in documentation
+            code_functions: Functions extracted from code (any iterable)
+            doc_functions: Functions referenced in documentation (any iterable)
         """
-        code_func_names = {f["name"] for f in code_functions}
-        doc_func_names = {f["name"] for f in doc_functions}
+        # Index each side by name once (first occurrence wins), so lookups
+        # are O(1) instead of a scan per discrepancy
+        code_by_name: Dict[str, Dict] = {}
+        for f in code_functions:
+            code_by_name.setdefault(f["name"], f)
+        doc_by_name: Dict[str, Dict] = {}
+        for f in doc_functions:
+            doc_by_name.setdefault(f["name"], f)
         
         # Find functions in code but not documented
-        undocumented = code_func_names - doc_func_names
-        for func_name in undocumented:
-            func = next(f for f in code_functions if f["name"] == func_name)
+        for func_name, func in code_by_name.items():
+            if func_name in doc_by_name:
+                continue
             self.discrepancies.append(
                 DiscrepancyReport(
                     type=DiscrepancyType.MISSING_DOCUMENTATION,
@@ -77,9 +83,9 @@ class Comparator:
             )
         
         # Find documented functions not in code
-        obsolete_docs = doc_func_names - code_func_names
-        for func_name in obsolete_docs:
-            func = next(f for f in doc_functions if f["name"] == func_name)
+        for func_name, func in doc_by_name.items():
+            if func_name in code_by_name:
+                continue
             self.discrepancies.append(
                 DiscrepancyReport(
                     type=DiscrepancyType.OUTDATED_EXAMPLE,
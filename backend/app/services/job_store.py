@@ -0,0 +1,161 @@
+"""
+Database-backed job state for background analyses.
+
+Keeps job status, progress and results out of process memory so every
+uvicorn worker sees the same jobs and state survives restarts. The job
+table doubles as the work queue: API processes add PENDING jobs and
+analysis workers claim them (see worker.py).
+"""
+
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.database_models import AnalysisJob
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETE = "complete"
+    ERROR = "error"
+
+
+class JobStore:
+    """Stores analysis job state in the application database."""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def create(self, job_id: str, github_url: str, status: str) -> None:
+        """Record a new job."""
+        with self.session_factory() as db:
+            db.add(AnalysisJob(id=job_id, github_url=github_url, status=_to_str(status)))
+            db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's state.
+
+        Returns:
+            Dict with status, github_url, result and progress (plus error
+            when the job failed), or None if the job doesn't exist
+        """
+        with self.session_factory() as db:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return None
+
+            state = {
+                "status": job.status,
+                "github_url": job.github_url,
+                "result": orjson.loads(job.result) if job.result is not None else None,
+                "progress": job.progress
+            }
+            if job.error is not None:
+                state["error"] = job.error
+            return state
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """
+        Update a job's state in a single statement.
+
+        Args:
+            job_id: Job to update
+            **fields: Any of status, progress, result (JSON-serializable; numpy
+                values allowed) or error
+        """
+        if "status" in fields:
+            fields["status"] = _to_str(fields["status"])
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = orjson.dumps(fields["result"], option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+        with self.session_factory() as db:
+            db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(fields)
+            db.commit()
+
+    def claim(self, job_id: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Move a pending job to processing, so exactly one worker runs it.
+
+        Args:
+            job_id: Job to claim, or None for the oldest pending job
+
+        Returns:
+            Dict with id and github_url, or None if there was nothing to claim
+        """
+        with self.session_factory() as db:
+            query = db.query(AnalysisJob).filter(AnalysisJob.status == JobStatus.PENDING.value)
+            if job_id is not None:
+                query = query.filter(AnalysisJob.id == job_id)
+            job = query.order_by(AnalysisJob.created_at).first()
+            if job is None:
+                return None
+
+            # Conditional update, so a worker that loses the race claims nothing
+            claimed = db.query(AnalysisJob).filter(
+                AnalysisJob.id == job.id,
+                AnalysisJob.status == JobStatus.PENDING.value
+            ).update({"status": JobStatus.PROCESSING.value})
+            db.commit()
+            return {"id": job.id, "github_url": job.github_url} if claimed else None
+
+    def pending_ids(self) -> List[str]:
+        """Ids of pending jobs, oldest first."""
+        with self.session_factory() as db:
+            rows = db.query(AnalysisJob.id).filter(
+                AnalysisJob.status == JobStatus.PENDING.value
+            ).order_by(AnalysisJob.created_at).all()
+            return [row.id for row in rows]
+
+    def requeue_stale(self, max_age_minutes: int) -> int:
+        """
+        Move processing jobs not updated for max_age_minutes back to pending.
+
+        A job stays PROCESSING if the process running it dies; claiming and
+        each progress update refresh updated_at, so an old one is abandoned.
+
+        Returns:
+            Number of jobs requeued
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=max_age_minutes)
+        with self.session_factory() as db:
+            requeued = db.query(AnalysisJob).filter(
+                AnalysisJob.status == JobStatus.PROCESSING.value,
+                func.coalesce(AnalysisJob.updated_at, AnalysisJob.created_at) < cutoff
+            ).update({"status": JobStatus.PENDING.value}, synchronize_session=False)
+            db.commit()
+            return requeued
+
+    def purge_finished(self, max_age_hours: int) -> int:
+        """
+        Delete complete/failed jobs last updated more than max_age_hours ago.
+
+        Keeps the job table (and its stored results) from growing forever.
+
+        Returns:
+            Number of jobs deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+        with self.session_factory() as db:
+            deleted = db.query(AnalysisJob).filter(
+                AnalysisJob.status.in_([JobStatus.COMPLETE.value, JobStatus.ERROR.value]),
+                func.coalesce(AnalysisJob.updated_at, AnalysisJob.created_at) < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+
+    def count(self) -> int:
+        """Number of stored jobs."""
+        with self.session_factory() as db:
+            return db.query(AnalysisJob).count()
+
+
+def _to_str(value: Any) -> str:
+    """Store enum members (e.g. JobStatus) by value."""
+    return value.value if isinstance(value, Enum) else value
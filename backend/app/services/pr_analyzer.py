@@ -6,15 +6,14 @@ in changed code files.
 """
 
 import re
+import importlib.util
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
-try:
-    from github import Github, GithubException
-    GITHUB_AVAILABLE = True
-except ImportError:
-    GITHUB_AVAILABLE = False
+# PyGithub is imported lazily in PRAnalyzer, same as IssueService in pr_service
+GITHUB_AVAILABLE = importlib.util.find_spec("github") is not None
+if not GITHUB_AVAILABLE:
     print("Warning: PyGithub not installed. PR analysis will not work.")
 
 from app.parsers.parser_factory import parse_code
@@ -60,7 +59,9 @@ class PRAnalyzer:
         Args:
             github_token: GitHub personal access token or fine-grained token
         """
-        if not GITHUB_AVAILABLE:
+        try:
+            from github import Github
+        except ImportError:
             raise ImportError("PyGithub is required for PR analysis")
         
         self.github = Github(github_token)
@@ -154,6 +155,8 @@ class PRAnalyzer:
         Returns:
             File content as string, or None if not found
         """
+        from github import GithubException
+        
         try:
             file = repo.get_contents(file_path, ref=ref)
             if file.encoding == 'base64':
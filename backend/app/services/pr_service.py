@@ -5,25 +5,96 @@ Automatically creates GitHub Issues with documentation discrepancies
 based on analysis results.
 """
 
+import io
 import re
+import logging
+import base64
+import importlib.util
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 
-try:
-    from github import Github, GithubException, InputGitAuthor
-    from git import Repo as GitRepo, GitCommandError
-    GITHUB_AVAILABLE = True
-except ImportError:
-    GITHUB_AVAILABLE = False
-    print("Warning: PyGithub not installed. Issue creation will not work.")
+logger = logging.getLogger(__name__)
+
+# PyGithub is imported lazily in IssueService so that importing this module
+# (e.g. at API worker boot) doesn't pay for requests/urllib3/pyjwt/cryptography.
+GITHUB_AVAILABLE = importlib.util.find_spec("github") is not None
+if not GITHUB_AVAILABLE:
+    logger.warning("PyGithub not installed. Issue creation will not work.")
 
 from app.core.config import settings
 from app.models.schemas import DiscrepancyReport
 
 
-@dataclass
+# Patterns used per discrepancy/request, compiled once at import
+_PARAM_RE = re.compile(r'def\s+\w+\s*\((.*?)\)')
+_PARAM_SPLIT_RE = re.compile(r'(\w+)\s*(?::\s*([^,=]+?))?\s*(?:=[^,]*)?(?:,|$)')
+_RETURN_RE = re.compile(r'->\s*(\w+)')
+_FUNC_DESC_RE = re.compile(r"function\s+['\"]?(\w+)['\"]?", re.IGNORECASE)
+_FUNC_DEF_RE = re.compile(r'def\s+(\w+)')
+# Optional .git suffix and a terminator anchor keep the suffix out of the
+# repo name without a second pattern or rstrip
+_REPO_URL_RE = re.compile(r'github\.com[/:]([\w-]+)/([\w.-]+?)(?:\.git)?(?:[/?#]|$)')
+
+# Severities listed in the Issue breakdown, most severe first
+_SEVERITY_ORDER = ('high', 'medium', 'low')
+
+# Canned GitHub error messages; only the repo name and error details vary
+_REPO_ACCESS_ERROR_TEMPLATE = (
+    "❌ Cannot access repository '{repo}'\n\n"
+    "🔐 Required Token Permissions:\n"
+    "   - 'repo' scope (Full control of private repositories)\n\n"
+    "📋 How to fix:\n"
+    "   1. Go to GitHub → Settings → Developer settings → Personal access tokens\n"
+    "   2. Edit your token or create a new one\n"
+    "   3. Select 'repo' scope (or all 'repo' permissions)\n"
+    "   4. If repository is in an organization, you may need:\n"
+    "      - Organization approval\n"
+    "      - SSO authorization (enable SSO for the token)\n\n"
+    "💡 For public repositories, basic 'public_repo' scope may work.\n"
+    "   For private repositories, you MUST have 'repo' scope.\n\n"
+    "Error details: {details}"
+)
+_REPO_NOT_ACCESSIBLE_TEMPLATE = (
+    "Repository not accessible. Possible reasons:\n"
+    "1. Token doesn't have 'repo' scope (needed for private repos)\n"
+    "2. Repository is private and token lacks access\n"
+    "3. Repository belongs to an organization requiring SSO authentication\n"
+    "Error: {details}"
+)
+_PERMISSION_DENIED_TEMPLATE = (
+    "Permission denied. Token may lack required scopes:\n"
+    "Required: 'repo' scope (full control of private repositories)\n"
+    "Error: {details}"
+)
+_AUTH_FAILED_TEMPLATE = (
+    "Authentication failed. Please check your GitHub token.\n"
+    "Error: {details}"
+)
+
+
+@lru_cache(maxsize=512)
+def _parse_repo_url_cached(repo_url: str) -> Optional[Tuple[str, str]]:
+    """Parse a GitHub repository URL into (owner, repo name)."""
+    match = _REPO_URL_RE.search(repo_url)
+    if match:
+        return match.group(1), match.group(2)
+    return None
+
+
+@lru_cache(maxsize=512)
+def _extract_return_type_cached(code_snippet: str) -> Optional[str]:
+    """Extract return type from code snippet (snippets recur per function)."""
+    match = _RETURN_RE.search(code_snippet)
+    if match:
+        return match.group(1)
+    return None
+
+
+@dataclass(slots=True, frozen=True)
 class IssueResult:
     """Result of Issue creation."""
     success: bool
@@ -51,72 +122,55 @@ class DocumentationGenerator:
         Returns:
             Generated markdown documentation
         """
-        doc_lines = []
-        
-        # Function header
-        doc_lines.append(f"# {function_name}\n")
-        
-        # Description
-        if discrepancy.description:
-            doc_lines.append(f"{discrepancy.description}\n")
-        
-        # Parameters section
+        params_section = ""
+        returns_section = ""
         if discrepancy.code_snippet:
-            # Extract parameters from code snippet
+            # Extract parameters and return type from code snippet
             params = self._extract_params_from_code(discrepancy.code_snippet)
             if params:
-                doc_lines.append("## Parameters\n")
-                for param in params:
-                    doc_lines.append(f"- `{param['name']}`: {param.get('type', 'Any')} - {param.get('description', '')}")
-                doc_lines.append("")
-        
-        # Return type
-        if discrepancy.code_snippet:
+                params_section = "## Parameters\n\n" + "".join(
+                    f"- `{param['name']}`: {param.get('type', 'Any')} - {param.get('description', '')}\n"
+                    for param in params
+                ) + "\n"
+            
             return_type = self._extract_return_type(discrepancy.code_snippet)
             if return_type:
-                doc_lines.append(f"## Returns\n")
-                doc_lines.append(f"`{return_type}` - {discrepancy.suggestion or 'Function return value'}\n")
-        
-        # Example/Usage
-        if code_snippet:
-            doc_lines.append("## Example\n")
-            doc_lines.append("```python")
-            doc_lines.append(code_snippet)
-            doc_lines.append("```\n")
-        
-        # Suggestion
-        if discrepancy.suggestion:
-            doc_lines.append("## Notes\n")
-            doc_lines.append(f"> {discrepancy.suggestion}\n")
+                returns_section = (
+                    f"## Returns\n\n"
+                    f"`{return_type}` - {discrepancy.suggestion or 'Function return value'}\n\n"
+                )
         
-        return "\n".join(doc_lines)
+        # Every section ends with a blank line; trim the last newline
+        doc = (
+            f"# {function_name}\n\n"
+            + (f"{discrepancy.description}\n\n" if discrepancy.description else "")
+            + params_section
+            + returns_section
+            + (f"## Example\n\n```python\n{code_snippet}\n```\n\n" if code_snippet else "")
+            + (f"## Notes\n\n> {discrepancy.suggestion}\n\n" if discrepancy.suggestion else "")
+        )
+        return doc[:-1]
     
     def _extract_params_from_code(self, code_snippet: str) -> List[Dict[str, str]]:
         """Extract parameters from code snippet."""
-        params = []
-        # Simple regex to find function parameters
-        match = re.search(r'def\s+\w+\s*\((.*?)\)', code_snippet)
-        if match:
-            param_str = match.group(1)
-            for param in param_str.split(','):
-                param = param.strip()
-                if param:
-                    parts = param.split(':')
-                    name = parts[0].strip()
-                    param_type = parts[1].strip() if len(parts) > 1 else None
-                    params.append({
-                        'name': name,
-                        'type': param_type or 'Any',
-                        'description': ''
-                    })
-        return params
+        match = _PARAM_RE.search(code_snippet)
+        if not match:
+            return []
+        
+        # One scan captures name and annotation, skipping any default value
+        return [
+            {
+                'name': m.group(1),
+                'type': (m.group(2) or 'Any').strip(),
+                'description': ''
+            }
+            for m in _PARAM_SPLIT_RE.finditer(match.group(1))
+            if m.group(1)
+        ]
     
     def _extract_return_type(self, code_snippet: str) -> Optional[str]:
         """Extract return type from code snippet."""
-        match = re.search(r'->\s*(\w+)', code_snippet)
-        if match:
-            return match.group(1)
-        return None
+        return _extract_return_type_cached(code_snippet)
     
     def generate_fix_summary(self, discrepancies: List[DiscrepancyReport]) -> Dict[str, List[DiscrepancyReport]]:
         """
@@ -125,26 +179,30 @@ class DocumentationGenerator:
         Returns:
             Dict mapping function names to their discrepancies
         """
-        grouped = {}
+        grouped = defaultdict(list)
+        # Discrepancies from a single-file analysis repeat the same name
+        # sources, so run the extraction regexes once per distinct source
+        names: Dict[Tuple, Optional[str]] = {}
         for disc in discrepancies:
             # Extract function name from location or description
-            func_name = self._extract_function_name(disc)
+            source = (disc.description, disc.code_snippet, disc.location)
+            if source not in names:
+                names[source] = self._extract_function_name(disc)
+            func_name = names[source]
             if func_name:
-                if func_name not in grouped:
-                    grouped[func_name] = []
                 grouped[func_name].append(disc)
-        return grouped
+        return dict(grouped)
     
     def _extract_function_name(self, discrepancy: DiscrepancyReport) -> Optional[str]:
         """Extract function name from discrepancy."""
         # Try to extract from description
-        match = re.search(r"function\s+['\"]?(\w+)['\"]?", discrepancy.description, re.IGNORECASE)
+        match = _FUNC_DESC_RE.search(discrepancy.description)
         if match:
             return match.group(1)
         
         # Try to extract from code snippet
         if discrepancy.code_snippet:
-            match = re.search(r'def\s+(\w+)', discrepancy.code_snippet)
+            match = _FUNC_DEF_RE.search(discrepancy.code_snippet)
             if match:
                 return match.group(1)
         
@@ -172,9 +230,13 @@ class IssueService:
         if not self.token:
             raise ValueError("GitHub token is required. Set GITHUB_TOKEN environment variable.")
         
-        if not GITHUB_AVAILABLE:
+        try:
+            from github import Github, GithubException, InputGitTreeElement
+        except ImportError:
             raise ImportError("PyGithub not installed. Install with: pip install PyGithub")
-        
+        self._Github = Github
+        self._GithubException = GithubException
+        self._InputGitTreeElement = InputGitTreeElement
         self.github = Github(self.token)
         self.doc_generator = DocumentationGenerator()
     
@@ -213,23 +275,14 @@ class IssueService:
             # Get repository (this will fail with 404/403 if token lacks access)
             try:
                 github_repo = self.github.get_repo(f"{owner}/{repo_name}")
-            except GithubException as e:
+            except self._GithubException as e:
                 if e.status == 404 or "Resource not accessible" in str(e):
                     return IssueResult(
                         success=False,
-                        error=f"❌ Cannot access repository '{owner}/{repo_name}'\n\n"
-                              f"🔐 Required Token Permissions:\n"
-                              f"   - 'repo' scope (Full control of private repositories)\n\n"
-                              f"📋 How to fix:\n"
-                              f"   1. Go to GitHub → Settings → Developer settings → Personal access tokens\n"
-                              f"   2. Edit your token or create a new one\n"
-                              f"   3. Select 'repo' scope (or all 'repo' permissions)\n"
-                              f"   4. If repository is in an organization, you may need:\n"
-                              f"      - Organization approval\n"
-                              f"      - SSO authorization (enable SSO for the token)\n\n"
-                              f"💡 For public repositories, basic 'public_repo' scope may work.\n"
-                              f"   For private repositories, you MUST have 'repo' scope.\n\n"
-                              f"Error details: {e.data.get('message', str(e)) if hasattr(e, 'data') else str(e)}"
+                        error=_REPO_ACCESS_ERROR_TEMPLATE.format(
+                            repo=f"{owner}/{repo_name}",
+                            details=e.data.get('message', str(e)) if hasattr(e, 'data') else str(e)
+                        )
                     )
                 raise
             
@@ -247,7 +300,7 @@ class IssueService:
                 issue_url=issue.html_url
             )
             
-        except GithubException as e:
+        except self._GithubException as e:
             error_msg = e.data.get('message', str(e)) if hasattr(e, 'data') else str(e)
             
             # Provide more helpful error messages
@@ -255,11 +308,7 @@ class IssueService:
                 if "not found" in error_msg.lower() or "Resource not accessible" in error_msg:
                     return IssueResult(
                         success=False,
-                        error=f"Repository not accessible. Possible reasons:\n"
-                              f"1. Token doesn't have 'repo' scope (needed for private repos)\n"
-                              f"2. Repository is private and token lacks access\n"
-                              f"3. Repository belongs to an organization requiring SSO authentication\n"
-                              f"Error: {error_msg}"
+                        error=_REPO_NOT_ACCESSIBLE_TEMPLATE.format(details=error_msg)
                     )
                 else:
                     return IssueResult(
@@ -269,15 +318,12 @@ class IssueService:
             elif e.status == 403:
                 return IssueResult(
                     success=False,
-                    error=f"Permission denied. Token may lack required scopes:\n"
-                          f"Required: 'repo' scope (full control of private repositories)\n"
-                          f"Error: {error_msg}"
+                    error=_PERMISSION_DENIED_TEMPLATE.format(details=error_msg)
                 )
             elif e.status == 401:
                 return IssueResult(
                     success=False,
-                    error=f"Authentication failed. Please check your GitHub token.\n"
-                          f"Error: {error_msg}"
+                    error=_AUTH_FAILED_TEMPLATE.format(details=error_msg)
                 )
             else:
                 return IssueResult(
@@ -292,18 +338,7 @@ class IssueService:
     
     def _parse_repo_url(self, repo_url: str) -> Optional[Tuple[str, str]]:
         """Parse GitHub repository URL to extract owner and repo name."""
-        # Handle various URL formats
-        patterns = [
-            r'github\.com[/:]([\w-]+)/([\w.-]+)',
-            r'github\.com[/:]([\w-]+)/([\w.-]+)\.git',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, repo_url)
-            if match:
-                return match.group(1), match.group(2).rstrip('.git')
-        
-        return None
+        return _parse_repo_url_cached(repo_url)
     
     def _generate_doc_files(
         self,
@@ -319,12 +354,29 @@ class IssueService:
         """
         files = []
         
-        # Group discrepancies by function
-        grouped = self.doc_generator.generate_fix_summary(discrepancies)
+        # List existing docs once via a recursive tree fetch instead of
+        # probing get_contents for every function
+        try:
+            tree = github_repo.get_git_tree(branch_name, recursive=True)
+            docs_index = {
+                entry.path: entry.sha
+                for entry in tree.tree
+                if entry.type == "blob" and entry.path.startswith("docs/")
+            }
+        except self._GithubException as e:
+            if e.status != 404:
+                raise
+            docs_index = {}
         
-        for func_name, func_discrepancies in grouped.items():
-            # Use the first discrepancy as primary source
-            primary_disc = func_discrepancies[0]
+        # Only the first discrepancy per function is used as the primary
+        # source, so skip later ones instead of grouping them all up front
+        seen: set[str] = set()
+        
+        for primary_disc in discrepancies:
+            func_name = self.doc_generator._extract_function_name(primary_disc)
+            if not func_name or func_name in seen:
+                continue
+            seen.add(func_name)
             
             # Generate documentation content
             doc_content = self.doc_generator.generate_doc_content(
@@ -336,23 +388,17 @@ class IssueService:
             # Determine file path
             doc_path = f"docs/{func_name}.md"
             
-            # Check if file already exists in the repo
-            existing_sha = None
-            try:
-                existing_file = github_repo.get_contents(doc_path, ref=branch_name)
-                # Append to existing file
-                existing_content = existing_file.decoded_content.decode('utf-8')
+            # Append to the existing file if it's already in the repo
+            existing_sha = docs_index.get(doc_path)
+            if existing_sha:
+                blob = github_repo.get_git_blob(existing_sha)
+                existing_content = base64.b64decode(blob.content).decode('utf-8')
                 doc_content = f"{existing_content}\n\n---\n\n{doc_content}"
-                existing_sha = existing_file.sha
-            except:
-                # File doesn't exist, create new
-                pass
             
             files.append({
                 'path': doc_path,
                 'content': doc_content,
-                'message': f"Add documentation for {func_name}",
-                'sha': existing_sha  # For updates
+                'message': f"Add documentation for {func_name}"
             })
         
         return files
@@ -364,39 +410,51 @@ class IssueService:
         files: List[Dict[str, str]]
     ):
         """
-        Commit multiple files to the repository.
+        Commit multiple files to the repository in a single commit.
         
-        Uses GitHub API create_file/update_file methods.
+        Uses the Git Data API: one blob per file, then one tree, one commit
+        and one ref update. Blobs inside a tree overwrite existing paths, so
+        new and existing files are handled the same way.
         """
+        if not files:
+            return None
+        
+        ref = github_repo.get_git_ref(f"heads/{branch_name}")
+        parent_commit = github_repo.get_git_commit(ref.object.sha)
+        
+        # A failed upload skips that file; the rest are still committed
+        uploaded = []
+        tree_elements = []
         for file_info in files:
-            path = file_info['path']
-            content = file_info['content']
-            existing_sha = file_info.get('sha')
-            message = file_info.get('message', f"Update {path}")
-            
             try:
-                if existing_sha:
-                    # Update existing file
-                    existing_file = github_repo.get_contents(path, ref=branch_name)
-                    github_repo.update_file(
-                        path=path,
-                        message=message,
-                        content=content,
-                        sha=existing_sha,
-                        branch=branch_name
-                    )
-                else:
-                    # Create new file
-                    github_repo.create_file(
-                        path=path,
-                        message=message,
-                        content=content,
-                        branch=branch_name
-                    )
+                blob_sha = github_repo.create_git_blob(file_info['content'], 'utf-8').sha
             except Exception as e:
-                # Log error but continue with other files
-                print(f"Warning: Failed to create/update {path}: {e}")
+                logger.warning("Failed to create/update %s: %s", file_info['path'], e)
                 continue
+            uploaded.append(file_info)
+            tree_elements.append(self._InputGitTreeElement(
+                path=file_info['path'],
+                mode='100644',
+                type='blob',
+                sha=blob_sha
+            ))
+        
+        if not tree_elements:
+            return None
+        
+        tree = github_repo.create_git_tree(tree_elements, base_tree=parent_commit.tree)
+        
+        messages = [f.get('message', f"Update {f['path']}") for f in uploaded]
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = f"Update documentation ({len(messages)} files)\n\n" + "\n".join(
+                f"- {m}" for m in messages
+            )
+        
+        commit = github_repo.create_git_commit(message, tree, [parent_commit])
+        ref.edit(commit.sha)
+        return commit
     
     def _generate_issue_title(self, metadata: Dict, discrepancy_count: int) -> str:
         """Generate Issue title from metadata."""
@@ -409,51 +467,49 @@ class IssueService:
         metadata: Dict
     ) -> str:
         """Generate Issue body with summary and details."""
-        lines = []
+        buf = io.StringIO()
         
         # Header
-        lines.append("## 📋 Documentation Discrepancies by Veritas.dev\n")
-        lines.append("This issue was automatically created based on code-documentation analysis.\n")
+        buf.write("## 📋 Documentation Discrepancies by Veritas.dev\n\n")
+        buf.write("This issue was automatically created based on code-documentation analysis.\n\n")
         
         # Summary
         trust_score = metadata.get('trust_score', 0)
         total_functions = metadata.get('total_functions', 0)
         verified = metadata.get('verified', 0)
         
-        lines.append("### 📊 Analysis Summary\n")
-        lines.append(f"- **Trust Score**: {trust_score}%")
-        lines.append(f"- **Total Functions**: {total_functions}")
-        lines.append(f"- **Verified**: {verified}")
-        lines.append(f"- **Issues Found**: {len(discrepancies)}\n")
+        buf.write(
+            f"### 📊 Analysis Summary\n\n"
+            f"- **Trust Score**: {trust_score}%\n"
+            f"- **Total Functions**: {total_functions}\n"
+            f"- **Verified**: {verified}\n"
+            f"- **Issues Found**: {len(discrepancies)}\n\n"
+        )
         
         # Issues breakdown
-        severity_counts = {}
-        for disc in discrepancies:
-            severity = disc.severity
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        severity_counts = Counter(disc.severity for disc in discrepancies)
         
         if severity_counts:
-            lines.append("### 🔍 Issues Breakdown\n")
-            for severity in ['high', 'medium', 'low']:
-                count = severity_counts.get(severity, 0)
-                if count > 0:
-                    lines.append(f"- **{severity.capitalize()}**: {count}")
-            lines.append("")
-        
-        # Discrepancies list
-        lines.append("### 📝 Documentation Discrepancies\n")
-        for i, disc in enumerate(discrepancies[:20], 1):  # Limit to first 20
-            lines.append(f"{i}. **{disc.type.value}** ({disc.severity})")
-            lines.append(f"   - {disc.description}")
-            if disc.suggestion:
-                lines.append(f"   - 💡 {disc.suggestion}")
-            lines.append("")
+            breakdown = [(s, severity_counts[s]) for s in _SEVERITY_ORDER if severity_counts[s]]
+            buf.write("### 🔍 Issues Breakdown\n\n")
+            buf.write("".join(f"- **{s.capitalize()}**: {count}\n" for s, count in breakdown))
+            buf.write("\n")
+        
+        # Discrepancies list (limited to the first 20)
+        buf.write("### 📝 Documentation Discrepancies\n\n")
+        buf.write("".join(
+            f"{i}. **{disc.type.value}** ({disc.severity})\n"
+            f"   - {disc.description}\n"
+            + (f"   - 💡 {disc.suggestion}\n" if disc.suggestion else "")
+            + "\n"
+            for i, disc in enumerate(discrepancies[:20], 1)
+        ))
         
         if len(discrepancies) > 20:
-            lines.append(f"\n*... and {len(discrepancies) - 20} more issues.*\n")
+            buf.write(f"\n*... and {len(discrepancies) - 20} more issues.*\n\n")
         
         # Footer
-        lines.append("---\n")
-        lines.append("*This issue was automatically created by [Veritas.dev](https://veritas.dev) - Automated Documentation Verification*")
+        buf.write("---\n\n")
+        buf.write("*This issue was automatically created by [Veritas.dev](https://veritas.dev) - Automated Documentation Verification*")
         
-        return "\n".join(lines)
+        return buf.getvalue()
\ No newline at end of file
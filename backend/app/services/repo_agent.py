@@ -5,13 +5,20 @@ Discovers code and documentation files, maps them intelligently,
 and extracts context for analysis.
 """
 
+import os
 import re
+import tarfile
 import tempfile
 import shutil
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+import requests
+
+from app.core.config import settings
+
 try:
     from git import Repo, InvalidGitRepositoryError, GitCommandError
     GIT_AVAILABLE = True
@@ -20,13 +27,63 @@ except ImportError:
     print("Warning: GitPython not installed. Repository cloning will not work.")
 
 
-@dataclass
+# Binary/generated file suffixes, checked (lowercased) before any other skip rule
+_BINARY_SUFFIXES = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.webp', '.bmp', '.pdf',
+    '.zip', '.tar', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.whl', '.jar', '.class',
+    '.pyc', '.pyo', '.so', '.dll', '.dylib', '.exe', '.o', '.a',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot', '.mp3', '.mp4', '.mov', '.webm',
+    '.lock',
+})
+
+# Large, uninformative files matched by exact (lowercased) name
+_EXACT_SKIP = frozenset({'package-lock.json', 'npm-shrinkwrap.json', 'pnpm-lock.yaml'})
+
+# Plain GitHub repository URL (no credentials), for the tarball fast path
+_GITHUB_REPO_RE = re.compile(r'^https://github\.com/([\w.-]+)/([\w.-]+?)(?:\.git)?/?$')
+
+
+def _suffix(name: str) -> str:
+    """File suffix of a name, with the same rules as Path.suffix."""
+    i = name.rfind('.')
+    return name[i:] if 0 < i < len(name) - 1 else ''
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode file bytes as UTF-8 with universal newlines, like read_text."""
+    content = raw.decode('utf-8', errors='ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _ci_glob(text: str) -> str:
+    """Case-insensitive gitignore-style glob for a literal, e.g. '.py' -> '.[pP][yY]'."""
+    return ''.join(f'[{c.lower()}{c.upper()}]' if c.isalpha() else c for c in text)
+
+
+@dataclass(slots=True)
 class FileCategory:
     """Represents a categorized file."""
     path: Path
     category: str  # 'code', 'doc', 'config', 'test', 'other'
     language: Optional[str] = None
     confidence: float = 1.0
+    # Lowercased name/suffix, computed once (the scanner passes them in)
+    name_lower: str = ''
+    suffix_lower: str = ''
+    # Decoded text, when read during discovery (code and doc files only)
+    content: Optional[str] = None
+    
+    def __post_init__(self):
+        if not self.name_lower:
+            self.name_lower = self.path.name.lower()
+            self.suffix_lower = self.path.suffix.lower()
+    
+    @property
+    def stem_lower(self) -> str:
+        """Lowercased file name without its suffix (like Path.stem)."""
+        return self.name_lower[:len(self.name_lower) - len(self.suffix_lower)]
 
 
 class RepoScanner:
@@ -62,6 +119,7 @@ class RepoScanner:
     
     # Documentation directory patterns
     DOC_DIRS = ['docs', 'documentation', 'doc', 'wiki', 'guides', 'manual']
+    _DOC_DIRS = frozenset(DOC_DIRS)
     
     # Documentation filename patterns
     DOC_PATTERNS = [
@@ -85,10 +143,35 @@ class RepoScanner:
         '.eggs', 'eggs', '.env', '.cache'
     ]
     
-    def discover_files(self, repo_path: Path) -> Dict[str, List[FileCategory]]:
+    # Compiled once at class load: exact names for the fast path, and a single
+    # regex for the "contains pattern" rule (only applied to patterns > 3 chars).
+    # Matching is per path component, so patterns containing a separator
+    # ('test/', '/tests/', ...) can never match and are left out.
+    _SKIP_DIRS = frozenset(CONFIG_PATTERNS)
+    _SKIP_RE = re.compile('|'.join(
+        re.escape(pattern)
+        for pattern in sorted(set(CONFIG_PATTERNS), key=len, reverse=True)
+        if len(pattern) > 3 and '/' not in pattern
+    ))
+    _DOC_NAME_RE = re.compile('|'.join(map(re.escape, DOC_PATTERNS)))
+    
+    # Sparse-checkout patterns covering every file that can be categorized
+    # as code or doc (extensions, doc directories, doc-like names)
+    SPARSE_PATTERNS = tuple(
+        [f'*{_ci_glob(ext)}' for ext in [*CODE_EXTENSIONS, *DOC_EXTENSIONS]]
+        + [f'{_ci_glob(doc_dir)}/' for doc_dir in DOC_DIRS]
+        + [f'*{_ci_glob(pattern)}*' for pattern in DOC_PATTERNS]
+    )
+    
+    def discover_files(self, repo_path: Path, read_contents: bool = False) -> Dict[str, List[FileCategory]]:
         """
         Discover and categorize all files in repository.
         
+        Args:
+            repo_path: Repository root
+            read_contents: Also read code and doc files into FileCategory.content
+                while the walk is in their directory
+        
         Returns:
             Dict with 'code', 'doc', and 'other' file lists
         """
@@ -101,59 +184,148 @@ class RepoScanner:
         if not repo_path.exists():
             return categorized
         
-        # Walk through repository
-        for file_path in repo_path.rglob('*'):
-            # Skip hidden files, config dirs, and non-files
-            if file_path.is_dir():
-                continue
-            
-            if self._should_skip(file_path):
+        # Walk through repository, pruning skipped directories as we go
+        self._walk(str(repo_path), categorized, read_contents)
+        
+        return categorized
+    
+    def _walk(self, root: str, categorized: Dict[str, List[FileCategory]], read_contents: bool) -> None:
+        """
+        Scan a directory tree with os.scandir.
+        
+        Skipped directories are pruned before they are queued, so their
+        subtrees are never listed (the same dirs[:] idea as in
+        git_utils.discover_files). Uses an explicit stack instead of
+        recursion. Each stack entry carries whether it sits under a doc
+        directory, so categorization never has to walk a file's parents.
+        With read_contents, code and doc files are read as soon as they're
+        categorized, while their directory entry is still cached.
+        """
+        pending = [(root, False)]
+        while pending:
+            dir_path, in_doc_dir = pending.pop()
+            subdirs = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            dir_lower = name.lower()
+                            if not self._matches_config_pattern(dir_lower):
+                                subdirs.append((entry.path, in_doc_dir or dir_lower in self._DOC_DIRS))
+                            continue
+                        
+                        suffix = _suffix(name)
+                        if not entry.is_file() or self._should_skip(name, suffix):
+                            continue
+                        
+                        # Categorize file
+                        category = self._categorize_file(
+                            entry.path, name.lower(), suffix.lower(), in_doc_dir
+                        )
+                        categorized[category.category].append(category)
+                        
+                        if read_contents and category.category != 'other':
+                            category.content = self._read_file(entry.path)
+            except OSError:
                 continue
             
-            # Categorize file
-            category = self._categorize_file(file_path)
-            
-            if category.category == 'code':
-                categorized['code'].append(category)
-            elif category.category == 'doc':
-                categorized['doc'].append(category)
-            else:
-                categorized['other'].append(category)
+            # Reversed so subdirectories are visited in listing order
+            pending.extend(reversed(subdirs))
+    
+    def discover_tarball(self, fileobj) -> Dict[str, List[FileCategory]]:
+        """
+        Discover and categorize files in a streamed .tar.gz (e.g. a GitHub tarball).
+        
+        Applies the same skip and categorization rules as discover_files.
+        Code and doc contents are read into FileCategory.content as members
+        stream past, since a streamed archive can't be revisited.
+        
+        Returns:
+            Dict with 'code', 'doc', and 'other' file lists (repo-relative paths)
+        """
+        categorized = {
+            'code': [],
+            'doc': [],
+            'other': []
+        }
+        
+        with tarfile.open(fileobj=fileobj, mode='r|gz') as archive:
+            for member in archive:
+                if not member.isreg():
+                    continue
+                
+                # Strip the archive's top-level "<owner>-<repo>-<sha>/" directory
+                rel_path = member.name.partition('/')[2]
+                dir_parts = rel_path.split('/')
+                name = dir_parts.pop()
+                if not name or any(self._matches_config_pattern(part.lower()) for part in dir_parts):
+                    continue
+                
+                suffix = _suffix(name)
+                if self._should_skip(name, suffix):
+                    continue
+                
+                in_doc_dir = any(part.lower() in self._DOC_DIRS for part in dir_parts)
+                category = self._categorize_file(rel_path, name.lower(), suffix.lower(), in_doc_dir)
+                categorized[category.category].append(category)
+                
+                if category.category != 'other':
+                    category.content = _decode_text(archive.extractfile(member).read())
         
         return categorized
     
-    def _should_skip(self, file_path: Path) -> bool:
-        """Check if file/directory should be skipped."""
-        path_str = str(file_path).lower()
-        path_parts = path_str.split('/')
-        path_parts.extend(path_str.split('\\'))  # Windows paths
+    def _read_file(self, path: str) -> Optional[str]:
+        """Read one discovered file, or None if it couldn't be read."""
+        try:
+            # One read and one decode, instead of text mode's chunked decoding
+            with open(path, 'rb') as f:
+                return _decode_text(f.read())
+        except OSError as e:
+            print(f"⚠️  Error reading {path}: {e}")
+            return None
+    
+    def _matches_config_pattern(self, part: str) -> bool:
+        """Check if a lowercased path component matches a config/test pattern."""
+        # Exact directory name, or contains one of the longer patterns
+        return part in self._SKIP_DIRS or self._SKIP_RE.search(part) is not None
+    
+    def _should_skip(self, name: str, suffix: str) -> bool:
+        """
+        Check if a file should be skipped.
+        
+        Directories are already pruned during the walk, so only the
+        file name itself needs checking here.
+        """
+        # Skip binary files and lockfiles first - cheapest check
+        filename_lower = name.lower()
+        if suffix.lower() in _BINARY_SUFFIXES or filename_lower in _EXACT_SKIP:
+            return True
         
         # Skip hidden files (but allow .github workflows, etc.)
-        if file_path.name.startswith('.') and file_path.name not in ['.md', '.json', '.txt']:
+        if name.startswith('.') and name not in ['.md', '.json', '.txt']:
             # Allow specific hidden files that are documentation
-            if file_path.suffix not in ['.md', '.txt'] and not file_path.name.startswith('.github'):
+            if suffix not in ['.md', '.txt'] and not name.startswith('.github'):
                 return True
         
-        # Skip config/test directories - check if any path part matches
-        for part in path_parts:
-            for pattern in self.CONFIG_PATTERNS:
-                # More precise matching - exact directory name or contains pattern
-                if part == pattern or (pattern in part and len(pattern) > 3):
-                    return True
+        # Skip config/test files
+        if self._matches_config_pattern(filename_lower):
+            return True
         
         # Skip test files by name pattern
-        filename_lower = file_path.name.lower()
         if filename_lower.startswith('test_') or filename_lower.startswith('tests_'):
-            if file_path.suffix in self.CODE_EXTENSIONS:
+            if suffix in self.CODE_EXTENSIONS:
                 return True
         
-        # Skip binary files
-        if file_path.suffix in ['.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.pdf', '.zip', '.tar', '.gz', '.pyc', '.pyo']:
-            return True
-        
         return False
     
-    def _categorize_file(self, file_path: Path) -> FileCategory:
+    def _categorize_file(
+        self,
+        entry_path: str,
+        filename_lower: str,
+        suffix: str,
+        in_doc_dir: bool
+    ) -> FileCategory:
         """
         Categorize a file using multiple heuristics.
         
@@ -162,69 +334,54 @@ class RepoScanner:
         2. Directory location
         3. Filename patterns
         4. Default to 'other'
+        
+        Args:
+            entry_path: Path of the file as a string
+            filename_lower: Lowercased file name
+            suffix: Lowercased file extension
+            in_doc_dir: Whether any parent directory is a doc directory
         """
-        filename_lower = file_path.name.lower()
-        path_str = str(file_path).lower()
-        suffix = file_path.suffix.lower()
-        parent_dirs = [p.name.lower() for p in file_path.parents]
+        language = None
         
         # Check code extensions
         if suffix in self.CODE_EXTENSIONS:
-            return FileCategory(
-                path=file_path,
-                category='code',
-                language=self.CODE_EXTENSIONS[suffix],
-                confidence=1.0
-            )
+            category, language, confidence = 'code', self.CODE_EXTENSIONS[suffix], 1.0
         
         # Check doc extensions
-        if suffix in self.DOC_EXTENSIONS:
+        elif suffix in self.DOC_EXTENSIONS:
             # If in code directory, might be docstring/code comment file
             # But .md files are usually documentation
-            if suffix == '.md':
-                return FileCategory(
-                    path=file_path,
-                    category='doc',
-                    language='markdown',
-                    confidence=0.95
-                )
-            else:
-                return FileCategory(
-                    path=file_path,
-                    category='doc',
-                    language=self.DOC_EXTENSIONS[suffix],
-                    confidence=0.9
-                )
+            language = self.DOC_EXTENSIONS[suffix]
+            category, confidence = 'doc', 0.95 if suffix == '.md' else 0.9
         
         # Check directory location
-        for doc_dir in self.DOC_DIRS:
-            if doc_dir in parent_dirs:
-                return FileCategory(
-                    path=file_path,
-                    category='doc',
-                    confidence=0.8
-                )
+        elif in_doc_dir:
+            category, confidence = 'doc', 0.8
         
         # Check filename patterns
-        for pattern in self.DOC_PATTERNS:
-            if pattern in filename_lower:
-                return FileCategory(
-                    path=file_path,
-                    category='doc',
-                    confidence=0.7
-                )
+        elif self._DOC_NAME_RE.search(filename_lower):
+            category, confidence = 'doc', 0.7
         
         # Default to other
+        else:
+            category, confidence = 'other', 0.5
+        
         return FileCategory(
-            path=file_path,
-            category='other',
-            confidence=0.5
+            path=Path(entry_path),
+            category=category,
+            language=language,
+            confidence=confidence,
+            name_lower=filename_lower,
+            suffix_lower=suffix
         )
 
 
 class DocCodeMapper:
     """Intelligent mapping between documentation and code files."""
     
+    # Filename patterns for global documentation
+    _GLOBAL_DOC_RE = re.compile('readme|api|changelog|contributing')
+    
     def map_docs_to_code(
         self,
         code_files: List[FileCategory],
@@ -245,103 +402,69 @@ class DocCodeMapper:
         code_paths = [cf.path for cf in code_files]
         doc_paths = [df.path for df in doc_files]
         
-        # Global documentation files
-        global_docs = self._find_global_docs(doc_paths)
+        # Index docs (and find global docs) in one pass, so each code file
+        # is matched with dict lookups instead of rescanning every doc file
+        by_stem, by_parent_name, by_dir, global_docs = self._index_docs(doc_files)
         
-        for code_file in code_paths:
-            matches = []
+        for code_cat, code_file in zip(code_files, code_paths):
+            code_dir = code_file.parent
             
-            # Strategy 1: Exact name match (without extension)
-            name_match = self._find_by_name(code_file, doc_paths)
-            if name_match:
-                matches.extend(name_match)
+            # Strategy 1: Exact name match, or code name is prefix of doc name
+            name_match = by_stem.get(code_cat.stem_lower, [])
             
-            # Strategy 2: Path similarity
-            path_match = self._find_by_path(code_file, doc_paths)
-            if path_match:
-                matches.extend(path_match)
+            # Strategy 2: Path similarity (docs sharing the parent directory name)
+            path_match = by_parent_name.get(code_dir.name, [])
             
-            # Strategy 3: Module-level docs (docs in same directory)
-            module_match = self._find_module_docs(code_file, doc_paths)
-            if module_match:
-                matches.extend(module_match)
+            # Strategy 3: Module-level docs (docs in same directory or parent),
+            # merged back into doc order
+            module_match = sorted(by_dir.get(code_dir, []) + by_dir.get(code_dir.parent, []))
+            
+            matches = [doc_paths[i] for i in name_match]
+            matches.extend(doc_paths[i] for i in path_match)
+            matches.extend(doc_paths[i] for i in module_match)
             
             # Strategy 4: Always include global docs
             matches.extend(global_docs)
             
             # Remove duplicates while preserving order
-            seen = set()
-            unique_matches = []
-            for match in matches:
-                if match not in seen:
-                    seen.add(match)
-                    unique_matches.append(match)
-            
-            mappings[code_file] = unique_matches
+            mappings[code_file] = list(dict.fromkeys(matches))
         
         return mappings
     
-    def _find_by_name(self, code_file: Path, doc_files: List[Path]) -> List[Path]:
-        """Find docs with same name as code file."""
-        code_stem = code_file.stem.lower()
-        matches = []
-        
-        for doc_file in doc_files:
-            doc_stem = doc_file.stem.lower()
-            # Exact match or code name is prefix of doc name
-            if doc_stem == code_stem or doc_stem.startswith(code_stem + '_'):
-                matches.append(doc_file)
-        
-        return matches
-    
-    def _find_by_path(self, code_file: Path, doc_files: List[Path]) -> List[Path]:
-        """Find docs with similar path structure."""
-        matches = []
-        code_parts = code_file.parts
+    def _index_docs(
+        self,
+        doc_files: List[FileCategory]
+    ) -> Tuple[Dict[str, List[int]], Dict[str, List[int]], Dict[Path, List[int]], List[Path]]:
+        """
+        Index doc files (by position) for the mapping strategies.
+        
+        Returns:
+            Tuple of (by lowercased stem and each "name_" prefix of it,
+            by parent directory name, by parent directory, global docs)
+        """
+        by_stem: Dict[str, List[int]] = defaultdict(list)
+        by_parent_name: Dict[str, List[int]] = defaultdict(list)
+        by_dir: Dict[Path, List[int]] = defaultdict(list)
+        global_docs = []
         
-        for doc_file in doc_files:
-            doc_parts = doc_file.parts
+        for i, doc_cat in enumerate(doc_files):
+            doc_file = doc_cat.path
+            # Global documentation (README, API.md, etc.) in root or one level deep
+            if len(doc_file.parts) <= 2 and self._GLOBAL_DOC_RE.search(doc_cat.name_lower):
+                global_docs.append(doc_file)
             
-            # Check if paths overlap significantly
-            # e.g., src/api/user.py → docs/api/user.md
-            code_rel = code_file.relative_to(code_file.parents[2] if len(code_file.parts) > 2 else code_file.parent)
-            doc_rel = doc_file.relative_to(doc_file.parents[2] if len(doc_file.parts) > 2 else doc_file.parent)
+            doc_stem = doc_cat.stem_lower
+            by_stem[doc_stem].append(i)
+            # user_guide.md should also match user.py
+            for pos, char in enumerate(doc_stem):
+                if char == '_':
+                    by_stem[doc_stem[:pos]].append(i)
             
-            # Simple heuristic: if they share parent directory name
-            if code_file.parent.name == doc_file.parent.name:
-                matches.append(doc_file)
-        
-        return matches
-    
-    def _find_module_docs(self, code_file: Path, doc_files: List[Path]) -> List[Path]:
-        """Find documentation in same directory or parent."""
-        matches = []
-        code_dir = code_file.parent
-        
-        for doc_file in doc_files:
             doc_dir = doc_file.parent
-            # Same directory or parent directory
-            if doc_dir == code_dir or doc_dir == code_dir.parent:
-                matches.append(doc_file)
+            by_parent_name[doc_dir.name].append(i)
+            by_dir[doc_dir].append(i)
         
-        return matches
-    
-    def _find_global_docs(self, doc_files: List[Path]) -> List[Path]:
-        """Find global documentation files (README, API.md, etc.)."""
-        global_patterns = ['readme', 'api', 'changelog', 'contributing']
-        global_docs = []
-        
-        for doc_file in doc_files:
-            filename_lower = doc_file.name.lower()
-            # Check if it's in root or docs/ directory
-            depth = len(doc_file.parts)
-            if depth <= 2:  # Root level or one level deep
-                for pattern in global_patterns:
-                    if pattern in filename_lower:
-                        global_docs.append(doc_file)
-                        break
-        
-        return global_docs
+        return by_stem, by_parent_name, by_dir, global_docs
 
 
 class RepoAgent:
@@ -361,9 +484,17 @@ class RepoAgent:
         """
         Clone repository, discover files, and prepare for analysis.
         
+        Public GitHub repositories are read straight from their tarball,
+        in memory; anything else (or a failed download) is cloned.
+        
         Returns:
             Dict with discovered files and mappings
         """
+        # Fast path: no clone, no temp directory
+        result = self._analyze_tarball(repo_url, branch)
+        if result is not None:
+            return result
+        
         if not GIT_AVAILABLE:
             raise RuntimeError("GitPython not available. Install with: pip install gitpython")
         
@@ -378,7 +509,7 @@ class RepoAgent:
             # Try to clone with specified branch, fallback to detecting default branch
             repo = None
             try:
-                repo = Repo.clone_from(repo_url, temp_dir, branch=branch, depth=1)
+                repo = self._clone(repo_url, temp_dir, branch=branch)
                 print(f"✅ Cloned branch '{branch}' to: {temp_dir}")
             except GitCommandError as e:
                 # If branch doesn't exist, try to detect default branch
@@ -387,13 +518,13 @@ class RepoAgent:
                     
                     # Try 'master' branch (common default for older repos)
                     try:
-                        repo = Repo.clone_from(repo_url, temp_dir, branch="master", depth=1)
+                        repo = self._clone(repo_url, temp_dir, branch="master")
                         print(f"✅ Cloned branch 'master' to: {temp_dir}")
                     except GitCommandError:
                         # Last resort: clone without specifying branch (gets default)
                         print(f"⚠️  Trying default branch...")
                         try:
-                            repo = Repo.clone_from(repo_url, temp_dir, depth=1)
+                            repo = self._clone(repo_url, temp_dir)
                             # Get the branch that was checked out
                             if hasattr(repo, 'active_branch'):
                                 default_branch = repo.active_branch.name
@@ -414,55 +545,14 @@ class RepoAgent:
             
             # Discover files
             print("🔍 Discovering files...")
-            categorized = self.scanner.discover_files(temp_dir)
+            categorized = self.scanner.discover_files(temp_dir, read_contents=True)
             
-            code_count = len(categorized['code'])
-            doc_count = len(categorized['doc'])
-            print(f"📁 Found {code_count} code files and {doc_count} doc files")
+            # Repo-relative paths, like the tarball path, so a repo gets the
+            # same mappings (and global docs) either way
+            for fc in categorized['code'] + categorized['doc']:
+                fc.path = fc.path.relative_to(temp_dir)
             
-            # Map docs to code
-            print("🗺️  Mapping documentation to code...")
-            mappings = self.mapper.map_docs_to_code(
-                categorized['code'],
-                categorized['doc']
-            )
-            
-            # Prepare file contents
-            # Note: Token Company compression happens in comparison engine during LLM calls
-            code_files_dict = {}
-            doc_files_dict = {}
-            
-            # Read code files
-            for file_cat in categorized['code']:
-                try:
-                    content = file_cat.path.read_text(encoding='utf-8', errors='ignore')
-                    # Use relative path as key
-                    rel_path = file_cat.path.relative_to(temp_dir)
-                    code_files_dict[str(rel_path)] = content
-                except Exception as e:
-                    print(f"⚠️  Error reading {file_cat.path}: {e}")
-                    continue
-            
-            # Read doc files
-            for file_cat in categorized['doc']:
-                try:
-                    content = file_cat.path.read_text(encoding='utf-8', errors='ignore')
-                    rel_path = file_cat.path.relative_to(temp_dir)
-                    doc_files_dict[str(rel_path)] = content
-                except Exception as e:
-                    print(f"⚠️  Error reading {file_cat.path}: {e}")
-                    continue
-            
-            return {
-                'temp_dir': temp_dir,
-                'code_files': code_files_dict,
-                'doc_files': doc_files_dict,
-                'mappings': {str(k): [str(v) for v in vs] for k, vs in mappings.items()},
-                'file_categories': {
-                    'code': [(str(cf.path.relative_to(temp_dir)), cf.language) for cf in categorized['code']],
-                    'doc': [(str(df.path.relative_to(temp_dir)), df.language) for df in categorized['doc']]
-                }
-            }
+            return self._build_result(categorized, temp_dir)
             
         except GitCommandError as e:
             # Cleanup on error
@@ -472,6 +562,123 @@ class RepoAgent:
             self.cleanup()
             raise
     
+    def _analyze_tarball(self, repo_url: str, branch: str) -> Optional[Dict]:
+        """
+        Analyze a public GitHub repository from its tarball, without touching disk.
+        
+        Returns:
+            Same dict as clone_and_analyze (with temp_dir None), or None if the
+            URL isn't a plain GitHub repo URL or no tarball could be downloaded
+        """
+        match = _GITHUB_REPO_RE.match(repo_url)
+        if not match:
+            return None
+        owner, repo_name = match.groups()
+        
+        try:
+            response = self._open_tarball(owner, repo_name, branch)
+            if response is None:
+                print("⚠️  Tarball not available, falling back to git clone")
+                return None
+            
+            print("🔍 Discovering files from tarball...")
+            with response:
+                response.raw.decode_content = True
+                categorized = self.scanner.discover_tarball(response.raw)
+        except (requests.RequestException, tarfile.TarError, OSError) as e:
+            print(f"⚠️  Tarball download failed ({e}), falling back to git clone")
+            return None
+        
+        return self._build_result(categorized, None)
+    
+    def _build_result(self, categorized: Dict[str, List[FileCategory]], temp_dir: Optional[Path]) -> Dict:
+        """Map docs to code and assemble the clone_and_analyze result (paths repo-relative)."""
+        print(f"📁 Found {len(categorized['code'])} code files and {len(categorized['doc'])} doc files")
+        
+        # Map docs to code
+        print("🗺️  Mapping documentation to code...")
+        mappings = self.mapper.map_docs_to_code(
+            categorized['code'],
+            categorized['doc']
+        )
+        
+        # File contents were read during discovery
+        # Note: Token Company compression happens in comparison engine during LLM calls
+        return {
+            'temp_dir': temp_dir,
+            'code_files': self._contents(categorized['code']),
+            'doc_files': self._contents(categorized['doc']),
+            'mappings': {str(k): [str(v) for v in vs] for k, vs in mappings.items()},
+            'file_categories': {
+                'code': [(str(cf.path), cf.language) for cf in categorized['code']],
+                'doc': [(str(df.path), df.language) for df in categorized['doc']]
+            }
+        }
+    
+    def _open_tarball(self, owner: str, repo_name: str, branch: str) -> Optional[requests.Response]:
+        """
+        Open a streamed tarball download, trying the branch, then master, then the default branch.
+        
+        Returns:
+            Streaming response, or None if no ref could be downloaded
+        """
+        requests_to_try = [
+            (f"https://codeload.github.com/{owner}/{repo_name}/tar.gz/{ref}", None)
+            for ref in dict.fromkeys([branch, "master"])
+        ]
+        # The API resolves the default branch, but unauthenticated calls are
+        # limited to 60 an hour; without a token, git clone finds it instead
+        if settings.GITHUB_TOKEN:
+            requests_to_try.append((
+                f"https://api.github.com/repos/{owner}/{repo_name}/tarball",
+                {"Authorization": f"Bearer {settings.GITHUB_TOKEN}"}
+            ))
+        
+        for url, headers in requests_to_try:
+            response = requests.get(url, headers=headers, stream=True, timeout=30)
+            if response.status_code == 200:
+                return response
+            response.close()
+        return None
+    
+    def _clone(self, repo_url: str, temp_dir: Path, branch: Optional[str] = None) -> "Repo":
+        """
+        Shallow, partial clone that only checks out files the scanner can use.
+        
+        Blobs are fetched lazily (--filter=blob:none) and a sparse checkout
+        limits the working tree to RepoScanner.SPARSE_PATTERNS, so binaries
+        and other assets are never downloaded. Falls back to a full checkout
+        on git versions without sparse-checkout.
+        """
+        kwargs = {'branch': branch} if branch else {}
+        try:
+            repo = Repo.clone_from(
+                repo_url,
+                temp_dir,
+                depth=1,
+                multi_options=['--filter=blob:none', '--no-checkout', '--single-branch'],
+                **kwargs
+            )
+            try:
+                repo.git.sparse_checkout('set', '--no-cone', *self.scanner.SPARSE_PATTERNS)
+            except GitCommandError as e:
+                print(f"⚠️  Sparse checkout unavailable, checking out all files: {e}")
+            repo.git.checkout('HEAD')
+        except GitCommandError:
+            # Leave temp_dir empty, so a retry with another branch can clone into it
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            temp_dir.mkdir()
+            raise
+        return repo
+    
+    def _contents(self, files: List[FileCategory]) -> Dict[str, str]:
+        """Map each file's path to its content, skipping unread files."""
+        return {
+            str(fc.path): fc.content
+            for fc in files
+            if fc.content is not None
+        }
+    
     def cleanup(self):
         """Clean up temporary directories."""
         for temp_dir in self.temp_dirs:
@@ -1,15 +1,68 @@
 import tempfile
 import shutil
-from git import Repo
+from typing import List, Optional
+from git import Repo, GitCommandError
 import os
 
-def clone_repo(github_url: str) -> str:
-    """Clone GitHub repo to temp directory."""
+# Files discover_files can use, as sparse-checkout patterns
+SOURCE_PATTERNS = ['*.py', '*.js', '*.ts', '*.tsx', '*.jsx', '*.md']
+
+def clone_repo(
+    github_url: str,
+    depth: Optional[int] = None,
+    blob_filter: Optional[str] = None,
+    sparse_paths: Optional[List[str]] = None
+) -> str:
+    """
+    Clone GitHub repo to temp directory.
+    
+    Args:
+        github_url: Repository to clone
+        depth: Shallow clone with this much history (e.g. 1)
+        blob_filter: Partial clone filter (e.g. "blob:none"), so file
+            contents are only downloaded for files that get checked out
+        sparse_paths: Only check out files matching these patterns
+    """
     temp_dir = tempfile.mkdtemp()
     print(f"📦 Cloning {github_url}...")
-    Repo.clone_from(github_url, temp_dir)
+    
+    multi_options = []
+    if blob_filter:
+        multi_options.append(f"--filter={blob_filter}")
+    if sparse_paths:
+        multi_options.append("--no-checkout")
+    kwargs = {"depth": depth} if depth else {}
+    repo = Repo.clone_from(github_url, temp_dir, multi_options=multi_options, **kwargs)
+    
+    if sparse_paths:
+        try:
+            repo.git.sparse_checkout("set", "--no-cone", *sparse_paths)
+        except GitCommandError as e:
+            print(f"⚠️ Sparse checkout unavailable, checking out all files: {e}")
+        repo.git.checkout("HEAD")
     return temp_dir
 
+def blob_shas(repo_path: str) -> dict:
+    """
+    Map each file in the clone's HEAD (by path, as discover_files returns
+    them) to its git blob SHA, from the tree alone - no files are read.
+    """
+    try:
+        listing = Repo(repo_path).git.ls_tree("-r", "-z", "HEAD")
+    except GitCommandError as e:
+        print(f"⚠️ Could not list blob SHAs: {e}")
+        return {}
+    
+    shas = {}
+    for entry in listing.split("\0"):
+        if not entry:
+            continue
+        meta, rel_path = entry.split("\t", 1)
+        _, object_type, sha = meta.split()
+        if object_type == "blob":
+            shas[os.path.join(repo_path, *rel_path.split("/"))] = sha
+    return shas
+
 def cleanup_repo(path: str):
     """Delete cloned repo."""
     shutil.rmtree(path, ignore_errors=True)
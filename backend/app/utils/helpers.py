@@ -1,21 +1,86 @@
-# Utility helpers - common functions for hashing, JSON parsing, and formatting
+# Utility helpers - common functions for hashing, IDs, JSON parsing, and formatting
 
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, Union
 import hashlib
 import json
+import os
+import threading
+import time
 
 
-def generate_hash(content: str) -> str:
+def generate_hash(content: Union[str, bytes]) -> str:
     """
     Generate SHA-256 hash of content.
     
     Args:
-        content: String content to hash
+        content: String or bytes content to hash (bytes are hashed without a copy)
         
     Returns:
         Hexadecimal hash string
     """
-    return hashlib.sha256(content.encode()).hexdigest()
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+def generate_file_hash(file_path: Union[str, Path]) -> str:
+    """
+    Generate SHA-256 hash of a file's contents.
+    
+    Streams the file through hashlib.file_digest, so the file is never
+    loaded into a Python string first.
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        Hexadecimal hash string
+    """
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+# Crockford base32 alphabet used by ULIDs
+_CROCKFORD32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# Last ULID's (timestamp, random part), so IDs from the same millisecond
+# keep their creation order
+_ulid_last = (0, 0)
+_ulid_lock = threading.Lock()
+
+
+def generate_ulid() -> str:
+    """
+    Generate a monotonic ULID: 26-char Crockford base32, 48-bit millisecond
+    timestamp followed by 80 random bits.
+    
+    IDs sort by creation time, so they index well as database keys. Within
+    one millisecond (or if the clock steps back) the previous ID's random
+    part is incremented, so IDs from this process always sort in order.
+    
+    Returns:
+        ULID string
+    """
+    global _ulid_last
+    with _ulid_lock:
+        timestamp = time.time_ns() // 1_000_000
+        last_timestamp, last_random = _ulid_last
+        if timestamp > last_timestamp:
+            random = int.from_bytes(os.urandom(10), 'big')
+        else:
+            timestamp, random = last_timestamp, last_random + 1
+            if random >> 80:
+                # Random part overflowed: borrow the next millisecond
+                timestamp, random = timestamp + 1, 0
+        _ulid_last = (timestamp, random)
+    
+    value = timestamp << 80 | random
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(_CROCKFORD32[index])
+    return ''.join(reversed(chars))
 
 
 def safe_json_loads(data: str, default: Any = None) -> Any:
@@ -0,0 +1,5 @@
+# Lets a bare `pytest` (not just `python -m pytest`) import app from backend/
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
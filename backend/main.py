@@ -1,12 +1,32 @@
-from fastapi import FastAPI, BackgroundTasks, Request  # ← Add Request
+from fastapi import FastAPI, HTTPException, Request  # ← Add Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any
-import uuid
+import os
+import re
+import time
+import asyncio
+import threading
+import multiprocessing
+import orjson
+from functools import partial
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from app.github.webhook_handler import handle_webhook
-from enum import Enum
+from app.core.config import settings
+from app.database import Base, engine
+from app.services.job_store import JobStore, JobStatus
+from app.utils.helpers import generate_ulid
+from app.utils.git_utils import clone_repo, discover_files, cleanup_repo, blob_shas, SOURCE_PATTERNS
+from app.parsers.parser_factory import parse_code_file, parse_doc_file
+from app.comparison.hybrid_engine import HybridComparator
 
-app = FastAPI(title="Veritas.dev API", version="1.0.0")
+# Job state lives in the database so all workers share it
+Base.metadata.create_all(bind=engine)
+
+# orjson encodes large results (thousands of issues) much faster than json
+app = FastAPI(title="Veritas.dev API", version="1.0.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,12 +35,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class JobStatus(str, Enum):
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETE = "complete"
-    ERROR = "error"
-
 class AnalyzeRequest(BaseModel):
     github_url: str
 
@@ -28,7 +42,18 @@ class JobResponse(BaseModel):
     job_id: str
     status: JobStatus
 
-jobs: Dict[str, Dict[str, Any]] = {}
+# Only plain https://github.com/<owner>/<repo> URLs are analyzed
+GITHUB_URL_RE = re.compile(r'^https://github\.com/[\w.-]+/[\w.-]+(?:\.git)?/?$')
+
+jobs = JobStore()
+
+# Analyses run on a bounded worker pool, off the event loop; extra jobs
+# wait in the pool's queue as PENDING. With ANALYSIS_WORKERS=0 jobs are
+# only queued, for separate worker processes (worker.py) to pick up.
+analysis_executor = ThreadPoolExecutor(
+    max_workers=settings.ANALYSIS_WORKERS,
+    thread_name_prefix="analysis"
+) if settings.ANALYSIS_WORKERS > 0 else None
 
 @app.get("/")
 def root():
@@ -39,116 +64,275 @@ def root():
             "health": "/health",
             "analyze": "POST /analyze",
             "results": "GET /results/{job_id}",
+            "stream": "GET /results/{job_id}/stream",
             "docs": "/docs"
         }
     }
 
 @app.get("/health")
 def health():
-    return {"status": "ok", "jobs": len(jobs)}
+    return {"status": "ok", "jobs": jobs.count()}
 
 @app.post("/analyze", response_model=JobResponse)
-async def analyze_repo(request: AnalyzeRequest, background_tasks: BackgroundTasks):
-    if not request.github_url.startswith("https://github.com/"):
-        return {"error": "Invalid GitHub URL"}, 400
+async def analyze_repo(request: AnalyzeRequest):
+    if not GITHUB_URL_RE.match(request.github_url):
+        raise HTTPException(status_code=400, detail="Invalid GitHub URL")
     
-    job_id = str(uuid.uuid4())[:8]
-    jobs[job_id] = {
-        "status": JobStatus.PENDING,
-        "github_url": request.github_url,
-        "result": None,
-        "progress": None
-    }
+    # Time-ordered, so new jobs append to the primary key index
+    job_id = generate_ulid()
+    await asyncio.to_thread(jobs.create, job_id, request.github_url, JobStatus.PENDING)
     
-    # Enable background processing
-    background_tasks.add_task(process_analysis, job_id, request.github_url)
+    # Queue for background processing
+    if analysis_executor is not None:
+        analysis_executor.submit(process_job, job_id)
     
     return JobResponse(job_id=job_id, status=JobStatus.PENDING)
 
 @app.get("/results/{job_id}")
 async def get_results(job_id: str):
-    if job_id not in jobs:
-        return {"error": "Job not found"}, 404
-    return jobs[job_id]
+    job = await asyncio.to_thread(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# How often the progress stream checks the job for changes (seconds)
+STREAM_POLL_INTERVAL = 0.5
+
+@app.get("/results/{job_id}/stream")
+async def stream_results(job_id: str):
+    """
+    Server-Sent Events stream of a job's state.
+    
+    Sends the job (as in /results) whenever its status or progress
+    changes, and closes after the complete/error event, so clients
+    don't have to poll.
+    """
+    job = await asyncio.to_thread(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        nonlocal job
+        last = None
+        while job is not None:
+            state = (job["status"], job["progress"])
+            if state != last:
+                last = state
+                yield b"data: " + orjson.dumps(job) + b"\n\n"
+            if job["status"] in (JobStatus.COMPLETE, JobStatus.ERROR):
+                return
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+            job = await asyncio.to_thread(jobs.get, job_id)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 @app.post("/github/webhook")
 async def github_webhook(request: Request):
     """GitHub App webhook endpoint."""
-    from app.github.webhook_handler import handle_webhook
     return await handle_webhook(request)
 
+@app.on_event("startup")
+def load_comparator():
+    """Load the comparison models while starting up, not in the first job."""
+    _get_comparator()
+
+@app.on_event("startup")
+def resume_jobs():
+    """
+    Queue jobs left over from a previous run: PENDING ones dropped from
+    the executor queue at shutdown, and PROCESSING ones whose process died.
+    """
+    requeued = jobs.requeue_stale(settings.JOB_STALE_MINUTES)
+    if requeued:
+        print(f"♻️  Requeued {requeued} stale job(s)")
+    if analysis_executor is not None:
+        # claim() is atomic, so a worker.py picking the same job up is harmless
+        for job_id in jobs.pending_ids():
+            analysis_executor.submit(process_job, job_id)
+
+@app.on_event("shutdown")
+def shutdown_analysis_workers():
+    """
+    Drop queued analyses (running ones finish in their threads) and stop
+    parse workers. Dropped jobs stay PENDING and are resumed on startup.
+    """
+    if analysis_executor is not None:
+        analysis_executor.shutdown(wait=False, cancel_futures=True)
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+
 # ============= BACKGROUND PROCESSING =============
 
-async def process_analysis(job_id: str, github_url: str):
-    """Background task to analyze repository."""
-    jobs[job_id]["status"] = JobStatus.PROCESSING
+# Below this many code files, process start-up costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 32
+
+# One process pool shared by all analyses, started on first use, so each
+# job doesn't pay for spawning workers and re-importing the parsers
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def _parse_context():
+    """Start method for parse workers (never fork from this multi-threaded server)."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_parse_context())
+        return _parse_pool
+
+def _parse_files(parse_file, paths: list, shas: dict) -> list:
+    """
+    Parse files with parse_file(path, blob_sha) and return all their
+    functions, in file order.
     
+    Parsing is CPU-bound, so large file lists fan out across the shared
+    process pool; chunksize amortizes the per-task IPC.
+    """
+    global _parse_pool
+    file_shas = [shas.get(path) for path in paths]
+    if len(paths) < PARALLEL_PARSE_MIN_FILES:
+        return list(chain.from_iterable(map(parse_file, paths, file_shas)))
+    
+    pool = _get_parse_pool()
+    try:
+        return list(chain.from_iterable(pool.map(parse_file, paths, file_shas, chunksize=8)))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next analysis
+        with _parse_pool_lock:
+            if _parse_pool is pool:
+                _parse_pool = None
+        raise
+
+# Pairs compared between progress updates: enough for every concurrent
+# LLM call to carry a full batch of pairs
+COMPARE_CHUNK_SIZE = HybridComparator.MAX_CONCURRENT_COMPARISONS * HybridComparator.LLM_BATCH_SIZE
+
+# One comparator (and embedding model) shared by all analyses
+_comparator = None
+_comparator_lock = threading.Lock()
+
+def _get_comparator() -> HybridComparator:
+    global _comparator
+    with _comparator_lock:
+        if _comparator is None:
+            _comparator = HybridComparator()
+        return _comparator
+
+# Seconds between purges of old finished jobs (per process)
+JOB_PURGE_INTERVAL = 3600
+
+_last_purge = None
+_purge_lock = threading.Lock()
+
+def _purge_finished_jobs():
+    """
+    Drop old finished jobs, so stored results don't accumulate forever.
+    
+    Runs at most once per JOB_PURGE_INTERVAL, not after every job. A
+    failure is only reported, so it never takes down the analysis worker.
+    """
+    global _last_purge
+    now = time.monotonic()
+    with _purge_lock:
+        if _last_purge is not None and now - _last_purge < JOB_PURGE_INTERVAL:
+            return
+        _last_purge = now
+    
+    try:
+        deleted = jobs.purge_finished(settings.JOB_RETENTION_HOURS)
+    except Exception as e:
+        print(f"⚠️  Failed to purge finished jobs: {e}")
+        return
+    if deleted:
+        print(f"🧹 Purged {deleted} finished job(s)")
+
+def _match_key(name: str) -> str:
+    """
+    Key for pairing code and doc functions (calculateTotal matches calculate_total).
+    
+    Leading underscores are kept, so _helper and __init__ don't pair with
+    helper and init.
+    """
+    stripped = name.lstrip("_")
+    return name[:len(name) - len(stripped)] + stripped.lower().replace("_", "")
+
+def _group_by_match_key(functions) -> dict:
+    groups = {}
+    for func in functions:
+        groups.setdefault(_match_key(func.name), []).append(func)
+    return groups
+
+def process_job(job_id: str):
+    """Run a queued job on analysis_executor, unless a worker claimed it first."""
+    job = jobs.claim(job_id)
+    if job is not None:
+        process_analysis(job["id"], job["github_url"])
+
+def process_analysis(job_id: str, github_url: str):
+    """Background task to analyze repository (for a job already claimed as PROCESSING)."""
     try:
-        # Import everything
-        from app.utils.git_utils import clone_repo, discover_files, cleanup_repo
-        from app.parsers.parser_factory import parse_code
-        from app.parsers.markdown_parser import parse_markdown
-        from app.comparison.hybrid_engine import HybridComparator
-        
         # Step 1: Clone repo
-        jobs[job_id]["progress"] = "Cloning repository..."
-        repo_path = clone_repo(github_url)
+        jobs.update(job_id, progress="Cloning repository...")
+        # Latest commit only, and only the files we parse
+        repo_path = clone_repo(github_url, depth=1, blob_filter="blob:none", sparse_paths=SOURCE_PATTERNS)
         files = discover_files(repo_path)
         
-        jobs[job_id]["progress"] = f"Found {len(files['code'])} code files, {len(files['docs'])} doc files"
+        jobs.update(job_id, progress=f"Found {len(files['code'])} code files, {len(files['docs'])} doc files")
         
         # Step 2: Parse code files (multi-language)
-        jobs[job_id]["progress"] = "Parsing code files..."
-        code_functions = []
-        
-        for code_file in files['code']:
-            try:
-                with open(code_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    functions = parse_code(code_file, content)
-                    code_functions.extend(functions)
-            except Exception as e:
-                print(f"Error parsing {code_file}: {e}")
+        jobs.update(job_id, progress="Parsing code files...")
+        # With the repo root and git's blob SHAs, the parsers reuse results
+        # for unchanged files without even reading them
+        shas = blob_shas(repo_path)
+        code_functions = _parse_files(partial(parse_code_file, root=repo_path), files['code'], shas)
         
-        jobs[job_id]["progress"] = f"Parsed {len(code_functions)} functions from code"
+        jobs.update(job_id, progress=f"Parsed {len(code_functions)} functions from code")
         
         # Step 3: Parse doc files
-        jobs[job_id]["progress"] = "Parsing documentation..."
-        doc_functions = []
+        jobs.update(job_id, progress="Parsing documentation...")
+        doc_functions = _parse_files(partial(parse_doc_file, root=repo_path), files['docs'], shas)
         
-        for doc_file in files['docs']:
-            try:
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    docs = parse_markdown(content)
-                    doc_functions.extend(docs)
-            except Exception as e:
-                print(f"Error parsing {doc_file}: {e}")
-        
-        jobs[job_id]["progress"] = f"Found {len(doc_functions)} documented functions"
+        jobs.update(job_id, progress=f"Found {len(doc_functions)} documented functions")
         
         # Step 4: Compare using HybridComparator
-        jobs[job_id]["progress"] = "Comparing code vs documentation..."
+        jobs.update(job_id, progress="Comparing code vs documentation...")
         
-        comparator = HybridComparator()
+        comparator = _get_comparator()
         all_issues = []
         verified_count = 0
-        total_comparisons = 0
         
-        # Match functions by name
-        code_func_map = {f.name.lower(): f for f in code_functions}
-        doc_func_map = {f.name.lower(): f for f in doc_functions}
+        # Match functions by name, ignoring case and camelCase/snake_case.
+        # Functions sharing a key pair up in order; leftovers on either
+        # side are reported rather than dropped
+        code_groups = _group_by_match_key(code_functions)
+        doc_groups = _group_by_match_key(doc_functions)
+        
+        matched = []
+        undocumented = []
+        for key, code_group in code_groups.items():
+            doc_group = doc_groups.get(key, ())
+            matched.extend(zip(code_group, doc_group))
+            undocumented.extend(code_group[len(doc_group):])
+        orphaned = [
+            doc_func
+            for key, doc_group in doc_groups.items()
+            for doc_func in doc_group[len(code_groups.get(key, ())):]
+        ]
+        
+        # Encode every function that will be compared in one embedding batch
+        comparator.prepare([code_func for code_func, _ in matched], [doc_func for _, doc_func in matched])
         
         # Compare functions that exist in both code and docs
-        for func_name in code_func_map.keys():
-            if func_name in doc_func_map:
-                total_comparisons += 1
-                code_func = code_func_map[func_name]
-                doc_func = doc_func_map[func_name]
-                
-                # Use hybrid comparator
-                result = comparator.compare(code_func, doc_func)
-                
+        total_comparisons = len(matched)
+        # LLM calls for different pairs overlap (order is kept). Reporting
+        # progress after each chunk also refreshes the job's updated_at, so
+        # requeue_stale doesn't take a long comparison for a dead worker
+        for start in range(0, total_comparisons, COMPARE_CHUNK_SIZE):
+            for result in comparator.compare_batch(matched[start:start + COMPARE_CHUNK_SIZE]):
                 if result.matches:
                     verified_count += 1
                 
@@ -162,30 +346,31 @@ async def process_analysis(job_id: str, github_url: str):
                         "docs_say": issue.docs_say,
                         "suggested_fix": issue.suggested_fix
                     })
+            
+            done = min(start + COMPARE_CHUNK_SIZE, total_comparisons)
+            jobs.update(job_id, progress=f"Compared {done}/{total_comparisons} functions")
         
         # Functions in code but not documented
-        for func_name, code_func in code_func_map.items():
-            if func_name not in doc_func_map:
-                all_issues.append({
-                    "severity": "medium",
-                    "function": code_func.name,
-                    "issue": "Function exists in code but is not documented",
-                    "code_has": f"{code_func.name}({', '.join(p.name for p in code_func.parameters)})",
-                    "docs_say": "No documentation found",
-                    "suggested_fix": f"Add documentation for {code_func.name}()"
-                })
+        for code_func in undocumented:
+            all_issues.append({
+                "severity": "medium",
+                "function": code_func.name,
+                "issue": "Function exists in code but is not documented",
+                "code_has": code_func.signature_str,
+                "docs_say": "No documentation found",
+                "suggested_fix": f"Add documentation for {code_func.name}()"
+            })
         
         # Functions documented but not in code
-        for func_name, doc_func in doc_func_map.items():
-            if func_name not in code_func_map:
-                all_issues.append({
-                    "severity": "high",
-                    "function": doc_func.name,
-                    "issue": "Function is documented but does not exist in code",
-                    "code_has": "Function not found in code",
-                    "docs_say": f"{doc_func.name}({', '.join(p.name for p in doc_func.parameters)})",
-                    "suggested_fix": f"Remove documentation for {doc_func.name}() or check if function was renamed"
-                })
+        for doc_func in orphaned:
+            all_issues.append({
+                "severity": "high",
+                "function": doc_func.name,
+                "issue": "Function is documented but does not exist in code",
+                "code_has": "Function not found in code",
+                "docs_say": doc_func.signature_str,
+                "suggested_fix": f"Remove documentation for {doc_func.name}() or check if function was renamed"
+            })
         
         # Calculate trust score
         if total_comparisons > 0:
@@ -194,8 +379,7 @@ async def process_analysis(job_id: str, github_url: str):
             trust_score = 0
         
         # Return final results
-        jobs[job_id]["status"] = JobStatus.COMPLETE
-        jobs[job_id]["result"] = {
+        result = {
             "trust_score": trust_score,
             "total_functions": len(code_functions),
             "documented_functions": len(doc_functions),
@@ -215,6 +399,8 @@ async def process_analysis(job_id: str, github_url: str):
             }
         }
         
+        jobs.update(job_id, status=JobStatus.COMPLETE, result=result)
+        
         cleanup_repo(repo_path)
         print(f"✅ Analysis complete! Trust score: {trust_score}%")
         
@@ -222,8 +408,9 @@ async def process_analysis(job_id: str, github_url: str):
         print(f"❌ Error in analysis: {e}")
         import traceback
         traceback.print_exc()
-        jobs[job_id]["status"] = JobStatus.ERROR
-        jobs[job_id]["error"] = str(e)
+        jobs.update(job_id, status=JobStatus.ERROR, error=str(e))
+    
+    _purge_finished_jobs()
 
 # ============= SERVER =============
 
@@ -7,6 +7,45 @@ from app.services.comparator import Comparator
 from app.models.schemas import DiscrepancyType
 
 
+# Shared, read-only inputs (tuples, so no test can mutate them for another)
+MISSING_DOCS_CODE = {
+    "functions": (
+        {"name": "documented_func", "line_number": 1},
+        {"name": "undocumented_func", "line_number": 5}
+    )
+}
+MISSING_DOCS_DOCS = {
+    "api_references": (
+        {"name": "documented_func", "line": 10},
+    )
+}
+
+OBSOLETE_DOCS_CODE = {
+    "functions": (
+        {"name": "current_func", "line_number": 1},
+    )
+}
+OBSOLETE_DOCS_DOCS = {
+    "api_references": (
+        {"name": "current_func", "line": 10},
+        {"name": "old_func", "line": 20}
+    )
+}
+
+IN_SYNC_CODE = {
+    "functions": (
+        {"name": "func1", "line_number": 1},
+        {"name": "func2", "line_number": 5}
+    )
+}
+IN_SYNC_DOCS = {
+    "api_references": (
+        {"name": "func1", "line": 10},
+        {"name": "func2", "line": 20}
+    )
+}
+
+
 class TestComparator:
     """Test cases for Comparator."""
     
@@ -16,20 +55,7 @@ class TestComparator:
     
     def test_detect_missing_documentation(self):
         """Test detection of undocumented functions."""
-        code_data = {
-            "functions": [
-                {"name": "documented_func", "line_number": 1},
-                {"name": "undocumented_func", "line_number": 5}
-            ]
-        }
-        
-        doc_data = {
-            "api_references": [
-                {"name": "documented_func", "line": 10}
-            ]
-        }
-        
-        discrepancies = self.comparator.compare(code_data, doc_data)
+        discrepancies = self.comparator.compare(MISSING_DOCS_CODE, MISSING_DOCS_DOCS)
         
         assert len(discrepancies) == 1
         assert discrepancies[0].type == DiscrepancyType.MISSING_DOCUMENTATION
@@ -37,20 +63,7 @@ class TestComparator:
     
     def test_detect_obsolete_documentation(self):
         """Test detection of documentation for non-existent functions."""
-        code_data = {
-            "functions": [
-                {"name": "current_func", "line_number": 1}
-            ]
-        }
-        
-        doc_data = {
-            "api_references": [
-                {"name": "current_func", "line": 10},
-                {"name": "old_func", "line": 20}
-            ]
-        }
-        
-        discrepancies = self.comparator.compare(code_data, doc_data)
+        discrepancies = self.comparator.compare(OBSOLETE_DOCS_CODE, OBSOLETE_DOCS_DOCS)
         
         assert len(discrepancies) == 1
         assert discrepancies[0].type == DiscrepancyType.OUTDATED_EXAMPLE
@@ -58,20 +71,6 @@ class TestComparator:
     
     def test_no_discrepancies(self):
         """Test when code and docs are in sync."""
-        code_data = {
-            "functions": [
-                {"name": "func1", "line_number": 1},
-                {"name": "func2", "line_number": 5}
-            ]
-        }
-        
-        doc_data = {
-            "api_references": [
-                {"name": "func1", "line": 10},
-                {"name": "func2", "line": 20}
-            ]
-        }
-        
-        discrepancies = self.comparator.compare(code_data, doc_data)
+        discrepancies = self.comparator.compare(IN_SYNC_CODE, IN_SYNC_DOCS)
         
         assert len(discrepancies) == 0
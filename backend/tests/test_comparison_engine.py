@@ -5,7 +5,10 @@ if __name__ == "__main__" and __package__ is None:
     backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     sys.path.insert(0, backend_root)
 
+from collections import OrderedDict
+
 from app.comparison.engine import GeminiComparator
+from app.comparison.hybrid_engine import HybridComparator
 from app.comparison.scorer import analyze_repository
 from app.models.function_signature import FunctionSignature, Parameter
 
@@ -57,6 +60,95 @@ def test_gemini_comparator_parses_json(monkeypatch):
     assert result.issues[0].severity == "high"
 
 
+def test_gemini_comparator_compare_batch(monkeypatch):
+    comparator = GeminiComparator()
+    prompts = []
+
+    def fake_compress_input(prompt: str, aggressiveness: float = 0.8):
+        return {"output": prompt, "compressed": False}
+
+    def fake_call_gemini(prompt: str) -> str:
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            # Out of order, and pair 2 is missing
+            return """
+            [
+              {"index": 1, "matches": false, "confidence": 40, "issues": ["Wrong return type"]},
+              {"index": 0, "matches": true, "confidence": 95, "issues": []}
+            ]
+            """
+        return '{"matches": true, "confidence": 88, "issues": []}'
+
+    monkeypatch.setattr(comparator.token_client, "compress_input", fake_compress_input)
+    monkeypatch.setattr(comparator, "_call_gemini", fake_call_gemini)
+
+    pairs = [
+        (_make_func("login", ["email"]), _make_func("login", ["email"])),
+        (_make_func("logout", []), _make_func("logout", [])),
+        (_make_func("refresh", ["token"]), _make_func("refresh", ["token"])),
+    ]
+
+    results = comparator.compare_batch(pairs)
+    # One call for the batch, one retry for the pair it left out
+    assert len(prompts) == 2
+    assert [r.confidence for r in results] == [95, 40, 88]
+    assert results[1].issues[0].function == "logout"
+
+
+def test_hybrid_comparator_does_not_cache_parse_fallback(monkeypatch):
+    comparator = HybridComparator(use_token_company=False)
+    # Class-level cache, so start from an empty one
+    monkeypatch.setattr(HybridComparator, "_cache", OrderedDict())
+    responses = iter(["not json", '{"matches": true, "confidence": 90, "issues": []}'])
+    monkeypatch.setattr(comparator.llm_comparator, "_call_gemini", lambda prompt: next(responses))
+
+    code_func = _make_func("get_user", ["uid"])
+    doc_func = _make_func("get_user", ["user_id", "fields"])
+
+    first = comparator.compare(code_func, doc_func)
+    assert first.method in ("hybrid", "llm_focused")
+    assert first.llm_confidence == 0
+    assert len(HybridComparator._cache) == 0
+
+    # The next compare asks the LLM again, and a parsed answer is cached
+    second = comparator.compare(code_func, doc_func)
+    assert second.llm_confidence == 90
+    assert len(HybridComparator._cache) == 1
+    assert comparator.compare(code_func, doc_func) is second
+
+
+def test_hybrid_comparator_batches_llm_pairs(monkeypatch):
+    comparator = HybridComparator(use_token_company=False)
+    monkeypatch.setattr(HybridComparator, "_cache", OrderedDict())
+    prompts = []
+
+    def fake_call_gemini(prompt: str) -> str:
+        prompts.append(prompt)
+        return """
+        [
+          {"index": 2, "matches": false, "confidence": 30, "issues": ["Missing parameter"]},
+          {"index": 0, "matches": true, "confidence": 90, "issues": []},
+          {"index": 1, "matches": true, "confidence": 85, "issues": []}
+        ]
+        """
+
+    monkeypatch.setattr(comparator.llm_comparator, "_call_gemini", fake_call_gemini)
+
+    # Parameter mismatches send each pair to the LLM
+    pairs = [
+        (_make_func(name, ["uid"]), _make_func(name, ["user_id", "fields"]))
+        for name in ("get_user", "get_order", "get_item")
+    ]
+    # Plus one the embeddings settle without the LLM
+    pairs.append((_make_func("login", ["email"]), _make_func("login", ["email"])))
+
+    results = comparator.compare_batch(pairs)
+    assert len(prompts) == 1
+    assert [r.llm_confidence for r in results[:3]] == [90, 85, 30]
+    assert results[2].issues[0].function == "get_item"
+    assert results[3].method == "embedding_only"
+
+
 def test_analyze_repository_trust_score(monkeypatch):
     comparator = GeminiComparator()
 
@@ -0,0 +1,136 @@
+"""Tests for the database-backed JobStore."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.database_models import AnalysisJob
+from app.services.job_store import JobStore, JobStatus
+
+
+URL = "https://github.com/user/repo"
+
+
+@pytest.fixture
+def session_factory():
+    # One shared in-memory connection, so every session sees the same tables
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def jobs(session_factory):
+    return JobStore(session_factory=session_factory)
+
+
+def _age(session_factory, job_id: str, **delta):
+    """Backdate a job's last update."""
+    with session_factory() as db:
+        db.query(AnalysisJob).filter(AnalysisJob.id == job_id).update(
+            {"updated_at": datetime.now(timezone.utc) - timedelta(**delta)}
+        )
+        db.commit()
+
+
+def test_create_and_get(jobs):
+    jobs.create("job-1", URL, JobStatus.PENDING)
+
+    assert jobs.get("job-1") == {
+        "status": "pending",
+        "github_url": URL,
+        "result": None,
+        "progress": None
+    }
+    assert jobs.get("missing") is None
+    assert jobs.count() == 1
+
+
+def test_update_result_and_error(jobs):
+    jobs.create("job-1", URL, JobStatus.PENDING)
+
+    jobs.update("job-1", progress="Parsing code files...")
+    assert jobs.get("job-1")["progress"] == "Parsing code files..."
+
+    jobs.update("job-1", status=JobStatus.COMPLETE, result={"trust_score": 80, "issues": []})
+    job = jobs.get("job-1")
+    assert job["status"] == JobStatus.COMPLETE
+    assert job["result"] == {"trust_score": 80, "issues": []}
+    assert "error" not in job
+
+    jobs.update("job-1", status=JobStatus.ERROR, error="clone failed")
+    assert jobs.get("job-1")["error"] == "clone failed"
+
+
+def test_claim(jobs):
+    jobs.create("job-1", URL, JobStatus.PENDING)
+    jobs.create("job-2", URL, JobStatus.PENDING)
+
+    assert jobs.claim("job-2") == {"id": "job-2", "github_url": URL}
+    # Already processing, so a second claim gets nothing
+    assert jobs.claim("job-2") is None
+    assert jobs.get("job-2")["status"] == JobStatus.PROCESSING
+
+    assert jobs.claim() == {"id": "job-1", "github_url": URL}
+    assert jobs.claim() is None
+
+
+def test_pending_ids(jobs):
+    jobs.create("job-1", URL, JobStatus.PENDING)
+    jobs.create("job-2", URL, JobStatus.PENDING)
+    jobs.claim("job-1")
+
+    assert jobs.pending_ids() == ["job-2"]
+
+
+def test_requeue_stale(jobs, session_factory):
+    jobs.create("stale", URL, JobStatus.PENDING)
+    jobs.create("live", URL, JobStatus.PENDING)
+    jobs.create("done", URL, JobStatus.PENDING)
+    jobs.claim("stale")
+    jobs.claim("live")
+    jobs.update("done", status=JobStatus.COMPLETE)
+    _age(session_factory, "stale", minutes=90)
+    _age(session_factory, "done", minutes=90)
+
+    assert jobs.requeue_stale(max_age_minutes=60) == 1
+    assert jobs.get("stale")["status"] == JobStatus.PENDING
+    assert jobs.get("live")["status"] == JobStatus.PROCESSING
+    assert jobs.get("done")["status"] == JobStatus.COMPLETE
+
+
+def test_progress_update_keeps_job_live(jobs, session_factory):
+    jobs.create("busy", URL, JobStatus.PENDING)
+    jobs.claim("busy")
+    _age(session_factory, "busy", minutes=90)
+
+    # A progress update is the job's heartbeat
+    jobs.update("busy", progress="Compared 64/200 functions")
+
+    assert jobs.requeue_stale(max_age_minutes=60) == 0
+    assert jobs.get("busy")["status"] == JobStatus.PROCESSING
+
+
+def test_purge_finished(jobs, session_factory):
+    for job_id in ("old-complete", "old-error", "new-complete", "old-pending"):
+        jobs.create(job_id, URL, JobStatus.PENDING)
+    jobs.update("old-complete", status=JobStatus.COMPLETE)
+    jobs.update("old-error", status=JobStatus.ERROR, error="boom")
+    jobs.update("new-complete", status=JobStatus.COMPLETE)
+    for job_id in ("old-complete", "old-error", "old-pending"):
+        _age(session_factory, job_id, hours=48)
+
+    assert jobs.purge_finished(max_age_hours=24) == 2
+    assert jobs.get("old-complete") is None
+    assert jobs.get("old-error") is None
+    assert jobs.get("new-complete") is not None
+    assert jobs.get("old-pending") is not None
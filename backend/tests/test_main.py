@@ -0,0 +1,143 @@
+"""Tests for function pairing in the legacy analysis pipeline (main.py)."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import main
+from app.comparison.hybrid_engine import HybridComparisonResult
+from app.database import Base
+from app.models.function_signature import FunctionSignature, Parameter
+from app.services.job_store import JobStore, JobStatus
+
+
+def _make_func(name: str, file_path: str = "app.py") -> FunctionSignature:
+    return FunctionSignature(
+        name=name,
+        parameters=[Parameter(name="value")],
+        return_type="str",
+        docstring="test doc",
+        line_number=1,
+        file_path=file_path,
+    )
+
+
+class FakeComparator:
+    """Matches every pair, and records what it was asked to compare."""
+
+    def __init__(self):
+        self.pairs = []
+
+    def prepare(self, code_functions, doc_functions):
+        pass
+
+    def compare_batch(self, pairs):
+        self.pairs.extend(pairs)
+        return [
+            HybridComparisonResult(
+                matches=True, confidence=95, issues=[],
+                embedding_score=0.95, llm_confidence=95, method="embedding_only"
+            )
+            for _ in pairs
+        ]
+
+
+@pytest.fixture
+def run_analysis(monkeypatch):
+    """Run process_analysis on given code/doc functions, skipping clone and parse."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    jobs = JobStore(session_factory=sessionmaker(bind=engine))
+    comparator = FakeComparator()
+
+    monkeypatch.setattr(main, "jobs", jobs)
+    monkeypatch.setattr(main, "clone_repo", lambda *args, **kwargs: "/repo")
+    monkeypatch.setattr(main, "discover_files", lambda path: {"code": ["app.py"], "docs": ["README.md"]})
+    monkeypatch.setattr(main, "blob_shas", lambda path: {})
+    monkeypatch.setattr(main, "cleanup_repo", lambda path: None)
+    monkeypatch.setattr(main, "_get_comparator", lambda: comparator)
+    monkeypatch.setattr(main, "_purge_finished_jobs", lambda: None)
+
+    def run(code_functions, doc_functions):
+        monkeypatch.setattr(
+            main, "_parse_files",
+            lambda parse_file, paths, shas: code_functions if paths == ["app.py"] else doc_functions
+        )
+        jobs.create("job-1", "https://github.com/user/repo", JobStatus.PROCESSING)
+        main.process_analysis("job-1", "https://github.com/user/repo")
+        job = jobs.get("job-1")
+        assert job["status"] == JobStatus.COMPLETE, job.get("error")
+        return job["result"], comparator.pairs
+
+    yield run
+    engine.dispose()
+
+
+def test_match_key():
+    assert main._match_key("calculateTotal") == main._match_key("calculate_total")
+    assert main._match_key("CalculateTotal") == main._match_key("calculate_total")
+    # Leading underscores are part of the key
+    assert main._match_key("_helper") != main._match_key("helper")
+    assert main._match_key("__init__") != main._match_key("init")
+    assert main._match_key("_private_name") == main._match_key("_privateName")
+
+
+def test_group_by_match_key_keeps_order():
+    functions = [_make_func("parse", "a.py"), _make_func("_parse"), _make_func("Parse", "b.py")]
+
+    groups = main._group_by_match_key(functions)
+
+    assert list(groups) == ["parse", "_parse"]
+    assert [f.file_path for f in groups["parse"]] == ["a.py", "b.py"]
+
+
+def test_process_analysis_pairs_by_match_key(run_analysis):
+    code_functions = [
+        _make_func("calculateTotal"),
+        _make_func("_helper"),
+        _make_func("load", "a.py"),
+        _make_func("load", "b.py"),
+        _make_func("load", "c.py"),
+        _make_func("save"),
+    ]
+    doc_functions = [
+        _make_func("calculate_total", "README.md"),
+        _make_func("helper", "README.md"),
+        _make_func("load", "README.md"),
+        _make_func("save", "README.md"),
+        _make_func("save", "API.md"),
+    ]
+
+    result, compared = run_analysis(code_functions, doc_functions)
+
+    # calculateTotal pairs with calculate_total; of the three code loads only
+    # the first has a doc; only one of the two save docs has code
+    assert [(code.name, doc.name) for code, doc in compared] == [
+        ("calculateTotal", "calculate_total"),
+        ("load", "load"),
+        ("save", "save"),
+    ]
+    assert compared[1][0].file_path == "a.py"
+    assert compared[2][1].file_path == "README.md"
+
+    undocumented = [
+        issue["function"] for issue in result["issues"]
+        if issue["issue"] == "Function exists in code but is not documented"
+    ]
+    orphaned = [
+        issue["function"] for issue in result["issues"]
+        if issue["issue"] == "Function is documented but does not exist in code"
+    ]
+    assert sorted(undocumented) == ["_helper", "load", "load"]
+    assert sorted(orphaned) == ["helper", "save"]
+
+    stats = result["stats"]
+    assert stats["functions_compared"] == len(compared) == 3
+    assert stats["undocumented_functions"] == len(undocumented)
+    assert stats["orphaned_docs"] == len(orphaned)
+    assert stats["functions_matched"] == result["verified"] == 3
@@ -1,10 +1,13 @@
-# Test script for parsers - run from nexhacks/ with: cd backend && python tests/test_parsers.py
+# Test script for parsers - run from nexhacks/ with: cd backend && python tests/test_parsers.py (or python -m tests.test_parsers)
 
 import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from pathlib import Path
 
-from app.parsers.parser_factory import parse_code, get_supported_extensions
+# Only needed when run as a script; pytest/-m already have backend/ on the path
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.parsers.parser_factory import get_parser_for, get_supported_extensions, precompile_all
 
 # Test samples for each language
 java_code = '''
@@ -79,38 +82,55 @@ async def fetch_user(user_id: str) -> dict:
 '''
 
 
-def run_tests():
-    print("=" * 60)
-    print("PARSER TESTS")
-    print("=" * 60)
-    print(f"\nSupported: {get_supported_extensions()}\n")
-    
-    tests = [
+# (name, filename, code, parser), each parser resolved once up front
+TESTS = tuple(
+    (name, filename, code, get_parser_for(filename))
+    for name, filename, code in (
         ("Java", "UserService.java", java_code),
         ("Markdown", "README.md", markdown_code),
         ("JSON", "openapi.json", json_code),
         ("JavaScript", "app.js", javascript_code),
         ("TypeScript", "app.ts", typescript_code),
         ("Python", "utils.py", python_code),
-    ]
+    )
+)
+
+# Report separators
+SEP = "=" * 60
+SUBSEP = "-" * 40
+
+
+def run_tests():
+    # Load every parser before the loop, so no sample pays for it
+    precompile_all()
     
-    for name, filename, code in tests:
-        print("-" * 40)
-        print(f"Testing {name} Parser ({filename})")
-        print("-" * 40)
-        results = parse_code(filename, code)
+    # Collect the report and write it once at the end
+    out = []
+    out.append(SEP)
+    out.append("PARSER TESTS")
+    out.append(SEP)
+    out.append(f"\nSupported: {get_supported_extensions()}\n")
+    
+    for name, filename, code, parser in TESTS:
+        out.append(SUBSEP)
+        out.append(f"Testing {name} Parser ({filename})")
+        out.append(SUBSEP)
+        results = parser(code, filename) if parser else []
         if results:
             for func in results:
                 params = ', '.join(p.name for p in func.parameters)
-                prefix = "async " if hasattr(func, 'is_async') and func.is_async else ""
-                print(f"  {prefix}{func.name}({params})")
-            print(f"  [OK] {len(results)} found\n")
+                prefix = "async " if getattr(func, 'is_async', False) else ""
+                out.append(f"  {prefix}{func.name}({params})")
+            out.append(f"  [OK] {len(results)} found\n")
         else:
-            print(f"  [SKIP] Parser not implemented or no results\n")
+            out.append(f"  [SKIP] Parser not implemented or no results\n")
+    
+    out.append(SEP)
+    out.append("DONE")
+    out.append(SEP)
     
-    print("=" * 60)
-    print("DONE")
-    print("=" * 60)
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""Tests for IssueService._commit_files."""
+
+from types import SimpleNamespace
+
+from app.services.pr_service import IssueService
+
+
+class FakeRepo:
+    """Records Git Data API calls; uploads of the paths in fail_on raise."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.blobs = []
+        self.trees = []
+        self.commits = []
+        self.ref = SimpleNamespace(object=SimpleNamespace(sha="parent-sha"), edited_to=None)
+        self.ref.edit = lambda sha: setattr(self.ref, "edited_to", sha)
+
+    def get_git_ref(self, ref):
+        assert ref == "heads/docs-fix"
+        return self.ref
+
+    def get_git_commit(self, sha):
+        return SimpleNamespace(sha=sha, tree="base-tree")
+
+    def create_git_blob(self, content, encoding):
+        if content in self.fail_on:
+            raise RuntimeError("upload failed")
+        self.blobs.append(content)
+        return SimpleNamespace(sha=f"blob-{len(self.blobs)}")
+
+    def create_git_tree(self, elements, base_tree=None):
+        self.trees.append((elements, base_tree))
+        return "new-tree"
+
+    def create_git_commit(self, message, tree, parents):
+        commit = SimpleNamespace(sha="new-commit", message=message, tree=tree, parents=parents)
+        self.commits.append(commit)
+        return commit
+
+
+def _files(*names):
+    return [
+        {"path": f"docs/{name}.md", "content": name, "message": f"Add documentation for {name}"}
+        for name in names
+    ]
+
+
+def test_commit_files_multi_file_message():
+    service = IssueService(github_token="test-token")
+    repo = FakeRepo()
+
+    commit = service._commit_files(repo, "docs-fix", _files("login", "logout"))
+
+    assert commit.message == (
+        "Update documentation (2 files)\n\n"
+        "- Add documentation for login\n"
+        "- Add documentation for logout"
+    )
+    elements, base_tree = repo.trees[0]
+    assert base_tree == "base-tree"
+    assert [e._identity["path"] for e in elements] == ["docs/login.md", "docs/logout.md"]
+    assert repo.ref.edited_to == "new-commit"
+
+
+def test_commit_files_skips_failed_uploads():
+    service = IssueService(github_token="test-token")
+    repo = FakeRepo(fail_on={"logout"})
+
+    commit = service._commit_files(repo, "docs-fix", _files("login", "logout"))
+
+    # Only the uploaded file is in the tree, and a single file keeps its own message
+    elements, _ = repo.trees[0]
+    assert [e._identity["path"] for e in elements] == ["docs/login.md"]
+    assert [e._identity["sha"] for e in elements] == ["blob-1"]
+    assert commit.message == "Add documentation for login"
+    assert repo.ref.edited_to == "new-commit"
+
+
+def test_commit_files_all_uploads_fail():
+    service = IssueService(github_token="test-token")
+    repo = FakeRepo(fail_on={"login", "logout"})
+
+    assert service._commit_files(repo, "docs-fix", _files("login", "logout")) is None
+    assert repo.trees == []
+    assert repo.commits == []
+    assert repo.ref.edited_to is None
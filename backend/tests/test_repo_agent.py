@@ -0,0 +1,68 @@
+"""Tests for RepoAgent's tarball and clone discovery paths."""
+
+import io
+import tarfile
+
+from app.services.repo_agent import RepoAgent
+
+
+# GitHub tarballs put everything under one "<owner>-<repo>-<sha>/" directory
+TOP_DIR = "octo-widgets-1a2b3c4"
+
+TREE = {
+    "README.md": "# Widgets\n",
+    "app/user.py": "def get_user(uid):\n    return uid\n",
+    "app/orders.py": "def place_order(item, qty=1):\r\n    pass\r\n",
+    "src/widgets.ts": "export function render(w: Widget): void {}\n",
+    "docs/user_guide.md": "## get_user(uid)\n",
+    "docs/app/orders.md": "## place_order(item)\n",
+    "docs/NOTES": "Plain-text notes in a doc directory\n",
+    "tests/test_user.py": "def test_get_user():\n    pass\n",
+    "node_modules/lib/index.js": "module.exports = {}\n",
+    "assets/logo.png": "not really a png",
+    "package-lock.json": "{}\n",
+}
+
+
+def _tarball() -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as archive:
+        for path, content in TREE.items():
+            data = content.encode()
+            info = tarfile.TarInfo(f"{TOP_DIR}/{path}")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _sorted_mappings(result):
+    return {code: sorted(docs) for code, docs in result["mappings"].items()}
+
+
+def test_tarball_matches_clone_discovery(tmp_path):
+    archive = _tarball()
+    agent = RepoAgent()
+
+    from_tarball = agent._build_result(agent.scanner.discover_tarball(io.BytesIO(archive)), None)
+
+    # The clone path on the same tree, extracted to disk
+    with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as extracted:
+        extracted.extractall(tmp_path, filter="data")
+    repo_root = tmp_path / TOP_DIR
+    categorized = agent.scanner.discover_files(repo_root, read_contents=True)
+    for fc in categorized["code"] + categorized["doc"]:
+        fc.path = fc.path.relative_to(repo_root)
+    from_clone = agent._build_result(categorized, repo_root)
+
+    assert sorted(from_tarball["code_files"]) == ["app/orders.py", "app/user.py", "src/widgets.ts"]
+    assert sorted(from_tarball["doc_files"]) == [
+        "README.md", "docs/NOTES", "docs/app/orders.md", "docs/user_guide.md"
+    ]
+    assert from_tarball["code_files"] == from_clone["code_files"]
+    assert from_tarball["doc_files"] == from_clone["doc_files"]
+    # CRLF line endings are normalized the same way on both paths
+    assert from_tarball["code_files"]["app/orders.py"] == "def place_order(item, qty=1):\n    pass\n"
+
+    assert _sorted_mappings(from_tarball) == _sorted_mappings(from_clone)
+    assert "README.md" in from_tarball["mappings"]["app/user.py"]
+    assert "docs/user_guide.md" in from_tarball["mappings"]["app/user.py"]
@@ -0,0 +1,43 @@
+"""
+Standalone analysis worker.
+
+Claims pending jobs from the shared job table and runs them, so analyses
+can run in separate processes (or machines) from the API. Start as many
+as needed next to the API:
+
+    python worker.py
+
+Set ANALYSIS_WORKERS=0 on the API to leave every job to the workers.
+"""
+
+import time
+
+from app.core.config import settings
+from main import jobs, process_analysis, _get_comparator
+
+# Seconds to wait before checking for new jobs when the queue is empty
+POLL_INTERVAL = 2.0
+
+
+def run_worker():
+    """Claim and analyze pending jobs until interrupted."""
+    # Load the comparison models up front, not in the first job
+    _get_comparator()
+    # Pick up jobs whose process died mid-analysis
+    jobs.requeue_stale(settings.JOB_STALE_MINUTES)
+    print("👷 Analysis worker started, waiting for jobs...")
+    while True:
+        job = jobs.claim()
+        if job is None:
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        print(f"📥 Claimed job {job['id']}: {job['github_url']}")
+        process_analysis(job["id"], job["github_url"])
+
+
+if __name__ == "__main__":
+    try:
+        run_worker()
+    except KeyboardInterrupt:
+        print("👋 Worker stopped")
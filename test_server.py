@@ -1,23 +1,44 @@
 # test_server.py - Quick environment test
 from fastapi import FastAPI
+from fastapi.responses import Response
+import importlib.util
+import orjson
+import os
 import uvicorn
 
+# C event loop / HTTP parser from uvicorn[standard]; uvloop isn't available on Windows
+UVLOOP_AVAILABLE = importlib.util.find_spec("uvloop") is not None
+HTTPTOOLS_AVAILABLE = importlib.util.find_spec("httptools") is not None
+
+# Static payloads, serialized once
+_ROOT = orjson.dumps({"message": "P3 is ready!", "status": "working"})
+_HEALTH = orjson.dumps({
+    "status": "ok",
+    "service": "veritas-test",
+    "p3": "environment verified"
+})
+
 app = FastAPI(title="P3 Test Server")
 
 @app.get("/")
 def root():
-    return {"message": "P3 is ready!", "status": "working"}
+    return Response(_ROOT, media_type="application/json")
 
 @app.get("/health")
 def health():
-    return {
-        "status": "ok",
-        "service": "veritas-test",
-        "p3": "environment verified"
-    }
+    return Response(_HEALTH, media_type="application/json")
 
 if __name__ == "__main__":
     print("🚀 Starting P3 test server...")
     print("📍 Visit: http://localhost:8000")
     print("📍 Docs: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Workers need the import-string form of the app
+    uvicorn.run(
+        "test_server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        workers=min(4, os.cpu_count() or 1),
+        log_level="warning"
+    )
\ No newline at end of file